@@ -50,6 +50,16 @@ def clean_data(df):
     """Replaces NaNs with None for JSON compatibility."""
     return df.replace({np.nan: None})
 
+def coerce_gps(df):
+    """
+    survey_units.gps_lat/gps_long are double precision: anything that isn't a finite
+    number ('None', '', stray text) is sent as NULL instead of failing the whole batch.
+    """
+    for col in ("gps_lat", "gps_long"):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").replace([np.inf, -np.inf], np.nan)
+    return df
+
 def normalize_id(series):
     """
     Ensures IDs are clean strings. 
@@ -195,7 +205,7 @@ def upload_assets():
         
         # Force string type for Phone Numbers/CNICs to prevent data loss
         df = pd.read_csv(f, dtype=str) 
-        df = clean_data(df)
+        df = clean_data(coerce_gps(df))
         
         data = df.to_dict(orient='records')
         total = len(data)
@@ -5,46 +5,21 @@ import pandas as pd
 st.title("Suthra Punjab Operations Center")
 st.write("Welcome to the Waste Management & Billing System")
 
-# Function to get total number of bills
+# Function to get the system KPIs in one round-trip
 @st.cache_data(ttl=60)
-def get_total_bills():
+def get_system_stats():
+    """
+    Fetches total bills, total paid amount and survey counts per city, aggregated
+    in Postgres by the dashboard_stats() function (database/dashboard_stats.sql).
+    """
     try:
-        response = supabase.table("bills").select("count", count="exact").execute()
-        return response.count if hasattr(response, 'count') else len(response.data)
+        stats = supabase.rpc("dashboard_stats").execute().data or {}
     except Exception as e:
-        st.error(f"Error fetching total bills: {str(e)}")
-        return 0
-
-# Function to get survey count for each city
-@st.cache_data(ttl=60)
-def get_survey_count_by_city():
-    try:
-        response = supabase.table("survey_units").select("city_district").execute()
-        if response.data:
-            df = pd.DataFrame(response.data)
-            survey_counts = df.groupby('city_district').size().reset_index(name='survey_count')
-            return survey_counts
-        return pd.DataFrame(columns=['city_district', 'survey_count'])
-    except Exception as e:
-        st.error(f"Error fetching survey counts: {str(e)}")
-        return pd.DataFrame(columns=['city_district', 'survey_count'])
-
-# Function to get total paid amount
-@st.cache_data(ttl=60)
-def get_total_paid_amount():
-    try:
-        # Use the correct column name: amount_paid
-        response = supabase.table("bills").select("amount_paid").eq("payment_status", "PAID").execute()
-        if response.data:
-            df = pd.DataFrame(response.data)
-            # Convert "amount_paid" to numeric, handling any non-numeric values
-            df["amount_paid"] = pd.to_numeric(df["amount_paid"], errors='coerce')
-            total_paid = df["amount_paid"].sum()
-            return total_paid
-        return 0.0
-    except Exception as e:
-        st.error(f"Error fetching total paid amount: {str(e)}")
-        return 0.0
+        st.error(f"Error fetching system metrics: {str(e)}")
+        stats = {}
+    
+    survey_counts = pd.DataFrame(stats.get("surveys_by_city") or [], columns=['city_district', 'survey_count'])
+    return stats.get("total_bills", 0), float(stats.get("total_paid") or 0), survey_counts
 
 # Display metrics
 st.subheader("System Metrics")
@@ -53,9 +28,7 @@ st.subheader("System Metrics")
 col1, col2, col3 = st.columns(3)
 
 # Get data
-total_bills = get_total_bills()
-total_paid = get_total_paid_amount()
-survey_data = get_survey_count_by_city()
+total_bills, total_paid, survey_data = get_system_stats()
 
 # Display KPIs
 with col1:
@@ -2,19 +2,28 @@ import streamlit as st
 from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode
 import pandas as pd
 
-def display_aggrid(df: pd.DataFrame, selection_mode="single", height=400):
+# Upper bound on rows sent through the component bridge in one go
+MAX_GRID_ROWS = 10000
+
+def display_aggrid(df: pd.DataFrame, selection_mode="single", height=400, max_rows=MAX_GRID_ROWS):
     """
     Renders a robust AgGrid table with pagination, filtering, and customization.
+    Paging and scrolling happen client-side in the grid, so moving between grid
+    pages does not rerun the script. Frames longer than max_rows are truncated.
     Returns the selected rows.
     """
     if df.empty:
         st.info("No data available to display.")
         return []
+    
+    if len(df) > max_rows:
+        st.caption(f"Showing the first {max_rows:,} of {len(df):,} rows.")
+        df = df.head(max_rows)
 
     gb = GridOptionsBuilder.from_dataframe(df)
     
     # Defaults
-    gb.configure_pagination(paginationAutoPageSize=False, paginationPageSize=20)
+    gb.configure_pagination(paginationAutoPageSize=False, paginationPageSize=50)
     gb.configure_side_bar() # Enable filters tool panel
     gb.configure_default_column(groupable=True, value=True, enableRowGroup=True, aggFunc="sum", editable=False)
     
@@ -22,7 +31,7 @@ def display_aggrid(df: pd.DataFrame, selection_mode="single", height=400):
     gb.configure_selection(selection_mode, use_checkbox=True)
     
     # Style config
-    gb.configure_grid_options(domLayout='normal')
+    gb.configure_grid_options(domLayout='normal', rowBuffer=20)
     
     gridOptions = gb.build()
     
@@ -3,83 +3,140 @@ Pagination component for the billing system.
 Provides reusable pagination functionality for large datasets.
 """
 import streamlit as st
-import math
-from typing import List, Any
+from typing import TYPE_CHECKING, List, Any, Tuple, Union
 
-def paginate_data(data: List[Any], page_size: int = 100, key_prefix: str = "pagination") -> List[Any]:
+# pandas is only needed for type hints; DataFrames are recognised by their iloc
+# indexer, so importing this module does not load pandas
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Page size choices offered by the selector
+_PAGE_SIZES = (50, 100, 200, 500)
+
+def _ceildiv(a: int, b: int) -> int:
+    """Integer ceiling division (no float round-trip)."""
+    return -(-a // b)
+
+def page_bounds(total_items: int, page_size: int = 100, key_prefix: str = "pagination") -> Tuple[int, int]:
     """
-    Paginate a list of data.
+    Render pagination controls and return the slice bounds for the current page.
     
     Args:
-        data (List[Any]): The data to paginate
+        total_items (int): Total number of items being paginated
         page_size (int): Number of items per page (default: 100)
         key_prefix (str): Prefix for Streamlit keys to avoid conflicts
         
     Returns:
-        List[Any]: The paginated data for the current page
+        Tuple[int, int]: Start (inclusive) and end (exclusive) indices of the current page
     """
-    if not data:
-        return []
+    # The selector's value wins once the user has picked a page size
+    page_size = st.session_state.get(f"{key_prefix}_page_size", page_size)
     
     # Calculate total pages
-    total_items = len(data)
-    total_pages = math.ceil(total_items / page_size)
+    total_pages = _ceildiv(total_items, page_size)
+    st.session_state[f"{key_prefix}_total_items"] = total_items
     
     # Initialize session state for current page if not exists
     page_key = f"{key_prefix}_current_page"
-    if page_key not in st.session_state:
-        st.session_state[page_key] = 1
+    current_page = st.session_state.setdefault(page_key, 1)
+    
+    # Step back if the data or the page size shrank under the current page
+    if current_page > max(total_pages, 1):
+        current_page = st.session_state[page_key] = max(total_pages, 1)
     
     # Create pagination controls
     col1, col2, col3, col4, col5 = st.columns([2, 1, 1, 1, 2])
     
     with col1:
-        if st.button("⏮️ First", key=f"{key_prefix}_first", disabled=st.session_state[page_key] <= 1):
+        if st.button("⏮️ First", key=f"{key_prefix}_first", disabled=current_page <= 1):
             st.session_state[page_key] = 1
             st.rerun()
     
     with col2:
-        if st.button("◀️ Prev", key=f"{key_prefix}_prev", disabled=st.session_state[page_key] <= 1):
-            st.session_state[page_key] -= 1
+        if st.button("◀️ Prev", key=f"{key_prefix}_prev", disabled=current_page <= 1):
+            st.session_state[page_key] = current_page - 1
             st.rerun()
     
     with col3:
-        st.write(f"Page {st.session_state[page_key]} of {total_pages}")
+        st.write(f"Page {current_page} of {total_pages}")
     
     with col4:
-        if st.button("Next ▶️", key=f"{key_prefix}_next", disabled=st.session_state[page_key] >= total_pages):
-            st.session_state[page_key] += 1
+        if st.button("Next ▶️", key=f"{key_prefix}_next", disabled=current_page >= total_pages):
+            st.session_state[page_key] = current_page + 1
             st.rerun()
     
     with col5:
-        if st.button("Last ⏭️", key=f"{key_prefix}_last", disabled=st.session_state[page_key] >= total_pages):
+        if st.button("Last ⏭️", key=f"{key_prefix}_last", disabled=current_page >= total_pages):
             st.session_state[page_key] = total_pages
             st.rerun()
     
     # Display page size selector
     st_cols = st.columns([1, 3])
     with st_cols[0]:
-        selected_page_size = st.selectbox(
+        st.selectbox(
             "Items per page:",
-            options=[50, 100, 200, 500],
-            index=[50, 100, 200, 500].index(min(page_size, 500)),
+            options=_PAGE_SIZES,
+            index=_PAGE_SIZES.index(min(page_size, 500)),
             key=f"{key_prefix}_page_size"
         )
     
-    # Update page size if changed
-    if selected_page_size != page_size:
-        page_size = selected_page_size
-        total_pages = math.ceil(total_items / page_size)
-        # Reset to first page if current page exceeds new total
-        if st.session_state[page_key] > total_pages:
-            st.session_state[page_key] = 1
-        st.rerun()
-    
     # Calculate start and end indices for current page
-    start_idx = (st.session_state[page_key] - 1) * page_size
+    start_idx = (current_page - 1) * page_size
     end_idx = min(start_idx + page_size, total_items)
     
-    # Return the data slice for current page
+    return start_idx, end_idx
+
+def page_request(page_size: int = 100, key_prefix: str = "pagination", reset_on: Any = None) -> Tuple[int, int]:
+    """
+    Read the current page and page size before the query runs, for server-side
+    pagination where only one page is fetched. Render the controls afterwards
+    with page_bounds(total_count, ...) using the same key_prefix.
+    
+    Args:
+        page_size (int): Default number of items per page (default: 100)
+        key_prefix (str): Prefix for Streamlit keys to avoid conflicts
+        reset_on (Any): Value such as the active filters; the page goes back to 1 when it changes
+        
+    Returns:
+        Tuple[int, int]: Current page number (1-based) and page size
+    """
+    page_key = f"{key_prefix}_current_page"
+    reset_key = f"{key_prefix}_reset_on"
+    if st.session_state.get(reset_key) != reset_on:
+        st.session_state[reset_key] = reset_on
+        st.session_state[page_key] = 1
+    
+    page = st.session_state.get(page_key, 1)
+    page_size = st.session_state.get(f"{key_prefix}_page_size", page_size)
+    
+    # Clamp against the count stored by the last page_bounds call
+    total_items = st.session_state.get(f"{key_prefix}_total_items")
+    if total_items is not None:
+        page = min(page, max(_ceildiv(total_items, page_size), 1))
+    
+    return page, page_size
+
+def paginate_data(data: Union["pd.DataFrame", List[Any]], page_size: int = 100, key_prefix: str = "pagination") -> Union["pd.DataFrame", List[Any]]:
+    """
+    Paginate a list or DataFrame of data.
+    
+    Args:
+        data (Union[pd.DataFrame, List[Any]]): The data to paginate
+        page_size (int): Number of items per page (default: 100)
+        key_prefix (str): Prefix for Streamlit keys to avoid conflicts
+        
+    Returns:
+        Union[pd.DataFrame, List[Any]]: The paginated data for the current page
+    """
+    if len(data) == 0:
+        return data
+    
+    start_idx, end_idx = page_bounds(len(data), page_size, key_prefix)
+    
+    # Return the data slice for current page; DataFrames are sliced positionally
+    # so only the visible rows are touched and dtypes are kept
+    if hasattr(data, "iloc"):
+        return data.iloc[start_idx:end_idx]
     return data[start_idx:end_idx]
 
 def paginated_dataframe(df, page_size: int = 100, key_prefix: str = "df_pagination"):
@@ -95,14 +152,6 @@ def paginated_dataframe(df, page_size: int = 100, key_prefix: str = "df_paginati
         st.info("No data to display.")
         return
     
-    # Paginate the dataframe
-    paginated_df = paginate_data(df.to_dict('records'), page_size, key_prefix)
-    
-    # Convert back to DataFrame for display
-    if paginated_df:
-        st.dataframe(pd.DataFrame(paginated_df), use_container_width=True)
-    else:
-        st.info("No data to display for this page.")
-
-# Import pandas here to avoid circular imports
-import pandas as pd
\ No newline at end of file
+    # Slice the DataFrame directly so dtypes survive and no per-row dicts are built
+    start_idx, end_idx = page_bounds(len(df), page_size, key_prefix)
+    st.dataframe(df.iloc[start_idx:end_idx], use_container_width=True)
@@ -1,7 +1,10 @@
 import streamlit as st
-from services import auth
+from services import auth, repository
 from utils.notifications import get_unread_notification_count
 
+# Navigation layout choices shown in the settings expander
+_NAV_LAYOUTS = ("Default", "Compact", "Expanded")
+
 # Global variable to store user's preferred navigation layout
 if 'nav_layout' not in st.session_state:
     st.session_state.nav_layout = 'default'  # default, compact, expanded
@@ -26,6 +29,7 @@ def render_sidebar():
             
             # Show notification count (will silently fail if notifications table doesn't exist)
             try:
+                # Cached in utils.notifications and cleared whenever notifications change
                 unread_count = get_unread_notification_count(user['id'])
                 if unread_count > 0:
                     st.markdown(f"🔔 **Notifications:** {unread_count} unread")
@@ -39,8 +43,8 @@ def render_sidebar():
             with st.expander("⚙️ Navigation Settings", expanded=False):
                 nav_layout = st.radio(
                     "Layout Style",
-                    options=["Default", "Compact", "Expanded"],
-                    index=["Default", "Compact", "Expanded"].index(st.session_state.nav_layout.capitalize()),
+                    options=_NAV_LAYOUTS,
+                    index=_NAV_LAYOUTS.index(st.session_state.nav_layout.capitalize()),
                     key="nav_layout_radio"
                 )
                 
@@ -130,6 +134,10 @@ def render_sidebar():
             col1, col2 = st.columns(2)
             with col1:
                 if st.button("🔄 Refresh", use_container_width=True):
+                    # Drop cached query results so the rerun pulls fresh data
+                    repository.fetch_data.clear()
+                    repository.fetch_paginated_data.clear()
+                    repository.clear_locations_cache()
                     st.rerun()
             
             with col2:
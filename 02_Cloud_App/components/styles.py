@@ -0,0 +1,22 @@
+# components/styles.py
+import os
+import streamlit as st
+
+# Stylesheets applied to every page, in order
+CSS_FILES = ("assets/style.css", "assets/mobile.css")
+
+@st.cache_resource
+def load_css_bundle() -> str:
+    """Reads the app stylesheets once per process; missing files (e.g. in dev) are skipped."""
+    css = []
+    for file_name in CSS_FILES:
+        if os.path.exists(file_name):
+            with open(file_name) as f:
+                css.append(f.read())
+    return "\n".join(css)
+
+def inject_css():
+    """Injects the cached stylesheet bundle into the current page."""
+    bundle = load_css_bundle()
+    if bundle:
+        st.markdown(f'<style>{bundle}</style>', unsafe_allow_html=True)
@@ -0,0 +1,21 @@
+-- SQL Function for Staff Login
+-- Checks the password inside Postgres, so the bcrypt hash never leaves the database and
+-- the app gets back only the columns it keeps in the session, in a single round-trip.
+-- Returns no row for an unknown username or a wrong password, so the function (callable
+-- with the anon key) hands out profile data only with the right password and both
+-- failures look the same; ok is always true on the row it does return.
+-- Requires the pgcrypto extension (enabled by default on Supabase, in the extensions schema).
+-- Call from the app with: supabase.rpc("auth_login", {"p_user": ..., "p_pw": ...}).execute()
+
+CREATE EXTENSION IF NOT EXISTS pgcrypto WITH SCHEMA extensions;
+
+CREATE OR REPLACE FUNCTION auth_login(p_user TEXT, p_pw TEXT)
+RETURNS TABLE(id INTEGER, role TEXT, full_name TEXT, assigned_city TEXT, is_active BOOLEAN, ok BOOLEAN) AS $$
+    -- Python's bcrypt writes $2b$ hashes; pgcrypto only reads the identical $2a$ format
+    SELECT s.id, s.role::text, s.full_name::text, s.assigned_city::text, s.is_active,
+           TRUE AS ok
+    FROM staff AS s
+    CROSS JOIN LATERAL (SELECT regexp_replace(s.password, '^\$2[by]\$', '$2a$') AS hash) AS h
+    WHERE s.username = p_user
+      AND crypt(p_pw, h.hash) = h.hash;
+$$ LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public, extensions;
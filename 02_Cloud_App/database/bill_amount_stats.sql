@@ -0,0 +1,33 @@
+-- SQL Function for the Bills Browser Snapshot
+-- Sums and averages amount_due over every bill matching the browser's filters in Postgres,
+-- so the totals cover all matching rows (a plain select is capped at PostgREST's max-rows)
+-- and the app receives one small JSON object instead of the amounts themselves.
+-- NULL arguments mean "no filter"; p_psid / p_survey_id are substring matches like ilike.
+-- Call from the app with:
+--   supabase.rpc("bill_amount_stats", {"p_start": ..., "p_end": ..., "p_statuses": [...],
+--                                      "p_channels": [...], "p_min_amount": ..., "p_psid": ...,
+--                                      "p_survey_id": ...}).execute()
+
+CREATE OR REPLACE FUNCTION bill_amount_stats(
+    p_start TIMESTAMP,
+    p_end TIMESTAMP,
+    p_statuses TEXT[] DEFAULT NULL,
+    p_channels TEXT[] DEFAULT NULL,
+    p_min_amount NUMERIC DEFAULT NULL,
+    p_psid TEXT DEFAULT NULL,
+    p_survey_id TEXT DEFAULT NULL
+)
+RETURNS JSON AS $$
+    SELECT json_build_object(
+        'total_due', COALESCE(SUM(amount_due), 0),
+        'avg_due', COALESCE(AVG(amount_due), 0)
+    )
+    FROM bills
+    WHERE uploaded_at >= p_start
+      AND uploaded_at <= p_end
+      AND (p_statuses IS NULL OR payment_status::text = ANY(p_statuses))
+      AND (p_channels IS NULL OR channel::text = ANY(p_channels))
+      AND (p_min_amount IS NULL OR amount_due >= p_min_amount)
+      AND (p_psid IS NULL OR psid::text ILIKE '%' || p_psid || '%')
+      AND (p_survey_id IS NULL OR survey_id_fk::text ILIKE '%' || p_survey_id || '%');
+$$ LANGUAGE sql STABLE SECURITY INVOKER;
@@ -0,0 +1,13 @@
+-- SQL View: bills joined to their survey unit's location
+-- Lets the app filter bills by tehsil / UC in one indexed query instead of
+-- first fetching every survey_id in the tehsil and sending them back as an IN list.
+
+CREATE OR REPLACE VIEW bills_with_location
+WITH (security_invoker = true) AS
+SELECT b.*, s.city_district, s.uc_name
+FROM bills b
+JOIN survey_units s ON b.survey_id_fk = s.survey_id;
+
+-- Indexes backing the join and the tehsil filter
+CREATE INDEX IF NOT EXISTS idx_bills_survey_id_fk ON bills(survey_id_fk);
+CREATE INDEX IF NOT EXISTS idx_survey_units_city_district ON survey_units(city_district);
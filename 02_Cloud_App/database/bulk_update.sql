@@ -0,0 +1,34 @@
+-- SQL Function for Per-Row Bulk Updates
+-- Updates many rows, each with its own values, in a single statement instead of one
+-- request per row. Every row in p_rows must carry p_key and the same set of columns;
+-- columns missing from a row would be set to NULL.
+-- Call from the app with: supabase.rpc("bulk_update", {"p_table": ..., "p_key": ..., "p_rows": [...]}).execute()
+
+CREATE OR REPLACE FUNCTION bulk_update(p_table TEXT, p_key TEXT, p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    set_list TEXT;
+    updated_count INTEGER;
+BEGIN
+    -- SET clause from the payload's columns (identifiers quoted, the key column excluded)
+    SELECT string_agg(format('%1$I = r.%1$I', col), ', ')
+    INTO set_list
+    FROM (
+        SELECT DISTINCT jsonb_object_keys(row_data) AS col
+        FROM jsonb_array_elements(p_rows) AS row_data
+    ) AS cols
+    WHERE col <> p_key;
+
+    IF set_list IS NULL THEN
+        RETURN 0;
+    END IF;
+
+    EXECUTE format(
+        'UPDATE %1$I AS t SET %2$s FROM jsonb_populate_recordset(NULL::%1$I, $1) AS r WHERE t.%3$I = r.%3$I',
+        p_table, set_list, p_key
+    ) USING p_rows;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql SECURITY INVOKER;
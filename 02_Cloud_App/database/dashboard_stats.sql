@@ -0,0 +1,30 @@
+-- SQL Function for Home Page KPIs
+-- Aggregates bills and survey units in Postgres so the app receives a single small
+-- JSON object instead of downloading whole tables to count and sum them in pandas.
+-- Call from the app with: supabase.rpc("dashboard_stats").execute()
+
+CREATE OR REPLACE FUNCTION dashboard_stats()
+RETURNS JSON AS $$
+    SELECT json_build_object(
+        'total_bills', (SELECT COUNT(*) FROM bills),
+        -- amount_paid may hold non-numeric text; skip it like pd.to_numeric(errors='coerce')
+        'total_paid', (
+            SELECT COALESCE(SUM(amount_paid::text::numeric), 0)
+            FROM bills
+            WHERE payment_status = 'PAID'
+              AND amount_paid::text ~ '^-?[0-9]+(\.[0-9]+)?$'
+        ),
+        'surveys_by_city', (
+            SELECT COALESCE(json_agg(json_build_object('city_district', city_district, 'survey_count', survey_count)), '[]'::json)
+            FROM (
+                SELECT city_district, COUNT(*) AS survey_count
+                FROM survey_units
+                GROUP BY city_district
+            ) AS per_city
+        )
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Indexes backing the aggregates above
+CREATE INDEX IF NOT EXISTS idx_bills_payment_status ON bills(payment_status);
+CREATE INDEX IF NOT EXISTS idx_survey_units_city_district ON survey_units(city_district);
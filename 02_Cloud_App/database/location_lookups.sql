@@ -0,0 +1,24 @@
+-- SQL Functions for the City / Union Council pickers
+-- Return each value once, deduplicated and sorted in Postgres, instead of the app
+-- downloading every unique_locations row and calling .unique() in pandas.
+-- Call from the app with: supabase.rpc("distinct_cities").execute()
+--                         supabase.rpc("ucs_of", {"city": "<city_district>"}).execute()
+
+CREATE OR REPLACE FUNCTION distinct_cities()
+RETURNS TABLE (city_district TEXT) AS $$
+    SELECT DISTINCT city_district
+    FROM unique_locations
+    WHERE city_district IS NOT NULL
+    ORDER BY city_district;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION ucs_of(city TEXT)
+RETURNS TABLE (uc_name TEXT) AS $$
+    SELECT DISTINCT uc_name
+    FROM unique_locations
+    WHERE city_district = city AND uc_name IS NOT NULL
+    ORDER BY uc_name;
+$$ LANGUAGE sql STABLE;
+
+-- Index backing both lookups
+CREATE INDEX IF NOT EXISTS idx_unique_locations_city_uc ON unique_locations(city_district, uc_name);
@@ -0,0 +1,9 @@
+-- Trigram Indexes for Substring Search
+-- repository.fetch_data / fetch_paginated_data(search=...) send ILIKE '%text%' filters,
+-- which a plain b-tree index cannot serve. pg_trgm GIN indexes let Postgres answer them
+-- without scanning the whole table.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA extensions;
+
+CREATE INDEX IF NOT EXISTS idx_bills_psid_trgm ON bills USING GIN (psid extensions.gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_bills_survey_id_fk_trgm ON bills USING GIN (survey_id_fk extensions.gin_trgm_ops);
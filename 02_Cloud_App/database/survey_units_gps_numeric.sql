@@ -0,0 +1,9 @@
+-- Migration: store survey unit GPS coordinates as numbers
+-- gps_lat / gps_long arrive as text ('None', '' or a number); values that are not
+-- valid numbers become NULL so clients no longer have to parse and guard each one.
+
+ALTER TABLE survey_units
+    ALTER COLUMN gps_lat TYPE DOUBLE PRECISION
+        USING CASE WHEN gps_lat::text ~ '^\s*-?[0-9]+(\.[0-9]+)?\s*$' THEN gps_lat::text::double precision END,
+    ALTER COLUMN gps_long TYPE DOUBLE PRECISION
+        USING CASE WHEN gps_long::text ~ '^\s*-?[0-9]+(\.[0-9]+)?\s*$' THEN gps_long::text::double precision END;
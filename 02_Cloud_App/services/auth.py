@@ -1,7 +1,5 @@
 import streamlit as st
 from services.db import supabase
-import time
-from utils.security import verify_password
 from utils.session import init_session
 
 def login(username, password):
@@ -10,12 +8,12 @@ def login(username, password):
     Returns: True if successful, False otherwise.
     """
     try:
-        # First, get the user by username to retrieve the hashed password
-        user_response = supabase.table("staff").select("*").eq("username", username).single().execute()
+        # The password is checked in Postgres (database/auth_login.sql), so the hash never
+        # leaves the database and only the session columns come back
+        user_response = supabase.rpc("auth_login", {"p_user": username, "p_pw": password}).execute()
         
-        user = user_response.data
-        # Check password against the 'password' field (which should contain the hashed password)
-        if user and verify_password(password, user.get('password', '')):
+        user = user_response.data[0] if user_response.data else None
+        if user and user.get('ok'):
             # Password is correct
             
             if not user.get('is_active', True):
@@ -28,13 +26,13 @@ def login(username, password):
             st.session_state["user_role"] = user.get('role', 'staff')
             st.session_state["user_name"] = user.get('full_name', 'User')
             st.session_state["assigned_city"] = user.get('assigned_city')
+            st.session_state["_current_user_cache"] = _build_current_user()
             
             # Initialize session management
             init_session()
             
-            # Persist role for UI logic
+            # Persist role for UI logic; the toast animates on its own, nothing to wait for
             st.toast(f"Welcome back, {user.get('full_name')}!", icon="👋")
-            time.sleep(1) # Visual feedback
             return True
         else:
             st.error("Invalid username or password.")
@@ -47,14 +45,11 @@ def login(username, password):
 
 def logout():
     """Clears session and reloads."""
-    for key in list(st.session_state.keys()):
-        del st.session_state[key]
+    st.session_state.clear()
     st.rerun()
 
-def get_current_user():
-    """Returns user dict from session if logged in."""
-    if not st.session_state.get("logged_in"):
-        return None
+def _build_current_user():
+    """Builds the user dict from the individual session keys."""
     return {
         "id": st.session_state.get("user_id"),
         "name": st.session_state.get("user_name"),
@@ -62,6 +57,18 @@ def get_current_user():
         "city": st.session_state.get("assigned_city")
     }
 
+def get_current_user():
+    """
+    Returns user dict from session if logged in.
+    The dict is built once at login and kept in session state (cleared on logout).
+    """
+    if not st.session_state.get("logged_in"):
+        return None
+    user = st.session_state.get("_current_user_cache")
+    if user is None or user["id"] != st.session_state.get("user_id"):
+        user = st.session_state["_current_user_cache"] = _build_current_user()
+    return user
+
 def require_auth():
     """Stops execution if not logged in and shows login form."""
     if not st.session_state.get("logged_in"):
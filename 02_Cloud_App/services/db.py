@@ -1,11 +1,57 @@
 import streamlit as st
 from supabase import create_client, Client
+import httpx
 import os
 from dotenv import load_dotenv
 
 # Load env vars primarily here to be safe, though Home.py does it too.
 load_dotenv()
 
+# postgrest-py decodes every response body with httpx.Response.json(), i.e. the stdlib
+# json module. orjson builds the same dicts/lists several times faster, so the PostgREST
+# session uses it when installed (other httpx users in the process are left alone).
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _decode_with_orjson(response: httpx.Response):
+    """
+    Response hook: gives this one response an orjson-backed json() method.
+    """
+    stdlib_json = response.json
+    
+    def orjson_json(**kwargs):
+        if kwargs:
+            # json.loads options (object_hook, parse_float, ...) have no orjson equivalent
+            return stdlib_json(**kwargs)
+        return orjson.loads(response.content)
+    
+    response.json = orjson_json
+
+# Keep-alive pool shared by all sessions' PostgREST calls
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=40)
+
+def _use_pooled_session(client: Client):
+    """
+    Tunes the PostgREST session in place: a larger keep-alive pool and orjson decoding.
+    The session itself is kept, so its TLS verification, proxy, redirect and HTTP/2
+    settings stay exactly as postgrest-py configured them.
+    """
+    session = client.postgrest.session
+    
+    # httpx has no public setter for limits; they live on each transport's connection pool
+    # (the default transport and any proxy mounts)
+    for transport in (session._transport, *session._mounts.values()):
+        pool = getattr(transport, "_pool", None)
+        if pool is not None:
+            pool._max_connections = _HTTP_LIMITS.max_connections
+            pool._max_keepalive_connections = _HTTP_LIMITS.max_keepalive_connections
+    
+    if orjson is not None:
+        hooks = session.event_hooks
+        session.event_hooks = {**hooks, "response": [*hooks["response"], _decode_with_orjson]}
+
 @st.cache_resource
 def get_supabase_client() -> Client:
     """
@@ -19,7 +65,9 @@ def get_supabase_client() -> Client:
         st.error("❌ Configuration Error: SUPABASE_URL or SUPABASE_KEY is missing.")
         st.stop()
         
-    return create_client(url, key)
+    client = create_client(url, key)
+    _use_pooled_session(client)
+    return client
 
 # Expose a ready-to-use instance
 supabase = get_supabase_client()
@@ -1,71 +1,191 @@
 from services.db import supabase
+import numpy as np
 import pandas as pd
 import streamlit as st
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time
+from time import monotonic
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
-@st.cache_data(ttl=60)
-def fetch_data(table_name: str, columns: str = "*", filters: dict = None, order_by: str = None):
+# Filter operators accepted in (column, operator, value) filters, mapped to postgrest-py builder methods
+_FILTER_OPS = {
+    "eq": "eq",
+    "neq": "neq",
+    "gt": "gt",
+    "gte": "gte",
+    "lt": "lt",
+    "lte": "lte",
+    "in": "in_",
+    "like": "like",
+    "ilike": "ilike",
+    "is": "is_",
+}
+
+def apply_filters(query, filters):
+    """
+    Pushes filters down into a PostgREST query so only matching rows leave the database.
+    filters: dict of column -> value for equality matches, or a list of
+    (column, operator, value) tuples, e.g. [("payment_status", "in", ["PAID"]), ("amount_due", "gte", 100)].
+    """
+    if not filters:
+        return query
+    
+    if isinstance(filters, dict):
+        for col, val in filters.items():
+            query = query.eq(col, val)
+        return query
+    
+    for col, op, val in filters:
+        if op not in _FILTER_OPS:
+            raise ValueError(f"Unsupported filter operator: {op}")
+        query = getattr(query, _FILTER_OPS[op])(col, val)
+    return query
+
+def search_filters(search) -> list:
+    """
+    Turns a {column: text} search into case-insensitive substring (ilike) filters.
+    """
+    return [(col, "ilike", f"%{text}%") for col, text in (search or {}).items()]
+
+def apply_search(query, search, fts: bool = False):
+    """
+    Pushes a {column: text} search down into a PostgREST query.
+    Plain searches are substring matches (ilike); with fts=True each text is a
+    websearch-style full-text query against the column (tsvector or indexed).
+    """
+    if not search:
+        return query
+    
+    if not fts:
+        return apply_filters(query, search_filters(search))
+    
+    for col, text in search.items():
+        query = query.text_search(col, text, options={"type": "websearch"})
+    return query
+
+def date_range_filters(column: str, start_date, end_date) -> list:
+    """
+    Builds filters matching every timestamp from the start of start_date to the end of end_date.
     """
-    Generic data fetcher with caching (1 min TTL).
-    filters: dict where key is column name and value is value to equal match.
+    return [
+        (column, "gte", datetime.combine(start_date, time.min).isoformat()),
+        (column, "lte", datetime.combine(end_date, time.max).isoformat()),
+    ]
+
+# Low-cardinality status columns kept as categoricals (small codes, fast value_counts/isin)
+_CATEGORY_COLUMNS = ("payment_status", "status", "priority", "role")
+
+# Numeric columns that may arrive as text ('None', ''); unparseable values become NaN
+_NUMERIC_COLUMNS = ("gps_lat", "gps_long")
+
+def _normalize_dtypes(df: pd.DataFrame, dtypes: dict = None) -> pd.DataFrame:
+    """
+    Move the JSON-built frame onto pyarrow-backed dtypes (strings live in one Arrow
+    buffer instead of a Python object per cell), then parse *_at timestamp columns
+    once (UTC), coerce text GPS coordinates to floats and store known status columns
+    as categoricals, so the cached frame already carries the dtypes pages filter and group on.
+    Columns the caller gave an explicit dtype for are left exactly as cast.
+    """
+    explicit = set(dtypes or ())
+    inferred = [col for col in df.columns if col not in explicit]
+    if explicit:
+        df = df.assign(**{col: df[col].convert_dtypes(dtype_backend="pyarrow") for col in inferred})
+    else:
+        df = df.convert_dtypes(dtype_backend="pyarrow")
+    for col in inferred:
+        if col.endswith("_at"):
+            df[col] = pd.to_datetime(df[col], errors="coerce", utc=True)
+        elif col in _NUMERIC_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+        elif col in _CATEGORY_COLUMNS:
+            df[col] = df[col].astype("category")
+    return df
+
+def _build_frame(records: list, dtypes: dict = None) -> pd.DataFrame:
+    """
+    Builds the DataFrame for a response with from_records. With a dtypes map the frame
+    is built from exactly those columns and cast once, instead of inferring each column.
+    """
+    if dtypes:
+        df = pd.DataFrame.from_records(records, columns=list(dtypes)).astype(dtypes, copy=False)
+    else:
+        df = pd.DataFrame.from_records(records)
+    return _normalize_dtypes(df, dtypes)
+
+def category_counts(series: pd.Series, label: str) -> pd.DataFrame:
+    """
+    Counts per value as a two-column frame (label, 'Count').
+    Categorical columns are counted with one np.bincount over their integer codes
+    (no hashing); anything else falls back to value_counts.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        counts = series.value_counts()
+        return pd.DataFrame({label: counts.index, 'Count': counts.values})
+    
+    codes = series.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))  # -1 marks nulls
+    return pd.DataFrame({label: series.cat.categories, 'Count': counts})
+
+@st.cache_data(ttl=60, max_entries=32, show_spinner=False)
+def fetch_data(table_name: str, columns: str = "*", filters=None, order_by: str = None, dtypes: dict = None,
+               search: dict = None, fts: bool = False):
+    """
+    Generic data fetcher with caching (1 min TTL, bounded to 32 distinct queries).
+    filters: equality dict or list of (column, operator, value) tuples, see apply_filters.
+    search: optional {column: text} matched in the database, see apply_search (fts for full-text).
+    dtypes: optional {column: dtype} map for the returned frame (see _build_frame).
+    Use the sidebar Refresh button (fetch_data.clear()) to force a reload.
     """
     try:
-        query = supabase.table(table_name).select(columns)
-        
-        if filters:
-            for col, val in filters.items():
-                query = query.eq(col, val)
+        query = apply_filters(supabase.table(table_name).select(columns), filters)
+        query = apply_search(query, search, fts)
         
         if order_by:
             # Simple ordering, defaults to Ascending
             query = query.order(order_by)
-            
+        
         response = query.execute()
         
         if response.data:
-            return pd.DataFrame(response.data)
+            return _build_frame(response.data, dtypes)
         return pd.DataFrame()
         
     except Exception as e:
         st.error(f"Error fetching data from {table_name}: {str(e)}")
         return pd.DataFrame()
 
-@st.cache_data(ttl=60)
-def fetch_paginated_data(table_name: str, columns: str = "*", filters: dict = None, 
-                       order_by: str = None, page: int = 1, page_size: int = 50):
+@st.cache_data(ttl=60, max_entries=32, show_spinner=False)
+def fetch_paginated_data(table_name: str, columns: str = "*", filters=None, 
+                       order_by: str = None, page: int = 1, page_size: int = 50, dtypes: dict = None,
+                       search: dict = None, fts: bool = False):
     """
     Fetch paginated data from a table with optimized limits to prevent over-fetching.
+    The page and its exact total come back in a single request (PostgREST returns the
+    count in the Content-Range header of the ranged select), so no separate count query
+    or RPC is needed.
     
     Args:
         table_name (str): Name of the table
         columns (str): Columns to select
-        filters (dict): Filter conditions
+        filters (dict | list): Filter conditions (see apply_filters)
         order_by (str): Column to order by
         page (int): Page number (1-based)
-        page_size (int): Number of records per page (max 50 to prevent over-fetching)
+        page_size (int): Number of records per page (max 500, the largest size the paginator offers)
+        dtypes (dict): Optional {column: dtype} map for the returned frame (see _build_frame)
+        search (dict): Optional {column: text} matched in the database (see apply_search)
+        fts (bool): Treat search texts as full-text queries instead of substrings
         
     Returns:
         tuple: (data_df, total_count)
     """
     # Limit page_size to prevent over-fetching
-    page_size = min(page_size, 50)
+    page_size = min(page_size, 500)
     
     try:
-        # First, get total count with filters applied
-        count_query = supabase.table(table_name).select("count", count="exact")
-        
-        if filters:
-            for col, val in filters.items():
-                count_query = count_query.eq(col, val)
-                
-        count_response = count_query.execute()
-        total_count = count_response.count if hasattr(count_response, 'count') else len(count_response.data)
-        
-        # Then fetch paginated data
-        query = supabase.table(table_name).select(columns)
-        
-        if filters:
-            for col, val in filters.items():
-                query = query.eq(col, val)
+        # The exact count comes back with the page itself, so one request covers both
+        query = apply_filters(supabase.table(table_name).select(columns, count="exact"), filters)
+        query = apply_search(query, search, fts)
         
         if order_by:
             query = query.order(order_by)
@@ -74,9 +194,10 @@ def fetch_paginated_data(table_name: str, columns: str = "*", filters: dict = No
         query = query.range((page - 1) * page_size, page * page_size - 1)
         
         response = query.execute()
+        total_count = response.count if response.count is not None else len(response.data)
         
         if response.data:
-            return pd.DataFrame(response.data), total_count
+            return _build_frame(response.data, dtypes), total_count
         return pd.DataFrame(), total_count
         
     except Exception as e:
@@ -108,19 +229,59 @@ def delete_record(table_name: str, id_column: str, id_value):
     except Exception as e:
         raise e
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes for location data
-def fetch_unique_locations():
+# Locations rarely change, so they are kept in-process until the table changes or the TTL runs out
+_LOCATIONS_CACHE = {}
+_LOCATIONS_LOCK = threading.Lock()
+_LOCATIONS_TTL = 300  # Upper bound (seconds), also covers a realtime socket that dropped silently
+_locations_subscribed = False
+
+def clear_locations_cache():
     """
-    Fetch unique locations with caching to prevent repeated queries.
+    Drops the cached locations so the next fetch_unique_locations call reloads them.
+    """
+    with _LOCATIONS_LOCK:
+        _LOCATIONS_CACHE.clear()
+
+def _subscribe_location_changes() -> bool:
+    """
+    Subscribes to unique_locations changes so any insert/update/delete clears the cache.
+    Returns False if realtime is not available for this client.
     """
     try:
-        response = supabase.table("unique_locations").select("*").execute()
-        if response.data:
-            return pd.DataFrame(response.data)
-        return pd.DataFrame()
-    except Exception as e:
-        st.error(f"Error fetching locations: {str(e)}")
-        return pd.DataFrame()
+        supabase.channel("locations").on_postgres_changes(
+            "*", schema="public", table="unique_locations",
+            callback=lambda payload: clear_locations_cache()
+        ).subscribe()
+        return True
+    except Exception:
+        return False
+
+def fetch_unique_locations():
+    """
+    Fetch unique locations, cached for up to 5 minutes and cleared early when the
+    table changes (via a realtime subscription, if available) or on sidebar Refresh.
+    """
+    global _locations_subscribed
+    
+    with _LOCATIONS_LOCK:
+        if not _locations_subscribed:
+            # Change events arrive on the realtime client's thread and wait for the lock there
+            _subscribe_location_changes()
+            _locations_subscribed = True
+        
+        cached = _LOCATIONS_CACHE.get("df")
+        if cached is not None and monotonic() - _LOCATIONS_CACHE["fetched_at"] < _LOCATIONS_TTL:
+            return cached.copy()
+        
+        try:
+            response = supabase.table("unique_locations").select("*").execute()
+            df = pd.DataFrame(response.data) if response.data else pd.DataFrame()
+        except Exception as e:
+            st.error(f"Error fetching locations: {str(e)}")
+            return pd.DataFrame()
+        
+        _LOCATIONS_CACHE.update(df=df, fetched_at=monotonic())
+        return df.copy()
 
 @st.cache_data(ttl=120)  # Cache for 2 minutes for staff data
 def fetch_active_staff():
@@ -134,4 +295,19 @@ def fetch_active_staff():
         return pd.DataFrame()
     except Exception as e:
         st.error(f"Error fetching staff: {str(e)}")
-        return pd.DataFrame()
\ No newline at end of file
+        return pd.DataFrame()
+
+def fetch_concurrently(*fetchers):
+    """
+    Runs independent zero-argument fetch callables in parallel and returns their results in order.
+    Supabase calls are blocking network I/O, so total latency is the slowest call rather than the sum.
+    """
+    ctx = get_script_run_ctx()
+    
+    def run(fetcher):
+        # Attach the page's script context so st.cache_data / st.error work inside the worker
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fetcher()
+    
+    with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+        return list(executor.map(run, fetchers))
\ No newline at end of file
@@ -3,16 +3,35 @@ Setup script to create the notifications table in Supabase.
 """
 import sys
 import os
+from functools import cache
+from pathlib import Path
 
 # Add the parent directory to the path so we can import our modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from services.db import supabase
 
+APP_DIR = Path(__file__).resolve().parent
+
+# Written once the table has been found, so later runs skip the Supabase round-trip.
+# Delete it to force a fresh check.
+BOOTSTRAP_STAMP = APP_DIR / ".notifications_bootstrapped"
+
+@cache
+def read_schema_sql():
+    """
+    Returns the notifications table DDL (read once per process).
+    """
+    return (APP_DIR / "database" / "notifications_schema.sql").read_text()
+
 def setup_notifications_table():
     """
     Create the notifications table in Supabase.
     """
+    if BOOTSTRAP_STAMP.exists():
+        print("Notifications table already set up (remove .notifications_bootstrapped to re-check).")
+        return True
+    
     try:
         print("Checking if notifications table exists...")
         
@@ -20,6 +39,7 @@ def setup_notifications_table():
         response = supabase.table("notifications").select("count").limit(1).execute()
         
         print("Notifications table already exists!")
+        BOOTSTRAP_STAMP.touch()
         return True
         
     except Exception as e:
@@ -28,8 +48,7 @@ def setup_notifications_table():
         print(f"Error: {e}")
         print("\nTo create the table, please run the following SQL in your Supabase SQL editor:")
         print("\n--- START SQL ---")
-        with open("database/notifications_schema.sql", "r") as f:
-            print(f.read())
+        print(read_schema_sql())
         print("--- END SQL ---")
         return False
 
@@ -3,9 +3,69 @@ Bulk operations utilities for the billing system.
 Provides functions for bulk data manipulation and updates.
 """
 import streamlit as st
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Callable
+from pydantic import TypeAdapter, ValidationError
 from services.db import supabase
+from components.forms import StaffModel
+
+# Batches are independent network round-trips, so several are sent at once
+MAX_BATCH_WORKERS = 8
+
+def _affected_rows(response) -> int:
+    """
+    Number of rows a write touched. Writes ask for return=minimal with count=exact,
+    so PostgREST sends only the count instead of echoing every row back.
+    """
+    if response.count is not None:
+        return response.count
+    return len(response.data) if response.data else 0
+
+# Validates a whole list of staff rows in one pydantic-core call (built once, reused)
+_STAFF_RECORDS = TypeAdapter(list[StaffModel])
+
+def _run_batches(items: List[Any], batch_size: int, run_batch: Callable[[List[Any]], int], 
+                 action: str) -> Dict[str, int]:
+    """
+    Run a batch operation over consecutive slices of items concurrently.
+    
+    Worker threads never call Streamlit; failures are collected and reported
+    with st.error once all batches have finished.
+    
+    Args:
+        items (List[Any]): IDs or records to process
+        batch_size (int): Number of items in each batch
+        run_batch (Callable[[List[Any]], int]): Processes one batch, returns the number of affected rows
+        action (str): Verb used in error messages (e.g. "updating")
+        
+    Returns:
+        Dict[str, int]: Results with 'success' and 'failed' counts
+    """
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    success_count = 0
+    failed_count = 0
+    errors = []
+    
+    if batches:
+        with ThreadPoolExecutor(max_workers=min(MAX_BATCH_WORKERS, len(batches))) as executor:
+            futures = {executor.submit(run_batch, batch): number for number, batch in enumerate(batches, start=1)}
+            for future in as_completed(futures):
+                number = futures[future]
+                try:
+                    success_count += future.result()
+                except Exception as e:
+                    errors.append((number, f"Error {action} batch {number}: {str(e)}"))
+                    failed_count += len(batches[number - 1])
+    
+    for _, message in sorted(errors):
+        st.error(message)
+    
+    return {
+        "success": success_count,
+        "failed": failed_count
+    }
 
 def bulk_update_records(table_name: str, record_ids: List[str], id_column: str, 
                        updates: Dict[str, Any], batch_size: int = 100) -> Dict[str, int]:
@@ -22,34 +82,47 @@ def bulk_update_records(table_name: str, record_ids: List[str], id_column: str,
     Returns:
         Dict[str, int]: Results with 'success' and 'failed' counts
     """
-    success_count = 0
-    failed_count = 0
+    def update_batch(batch_ids):
+        # Build the query for batch update and apply filter for this batch
+        query = supabase.table(table_name).update(updates, count="exact", returning="minimal").in_(id_column, batch_ids)
+        response = query.execute()
+        
+        # Count successful updates
+        return _affected_rows(response)
     
     # Process in batches to avoid timeouts
-    for i in range(0, len(record_ids), batch_size):
-        batch_ids = record_ids[i:i + batch_size]
+    return _run_batches(record_ids, batch_size, update_batch, "updating")
+
+def bulk_update_records_per_row(table_name: str, id_column: str, rows: List[Dict[str, Any]], 
+                                batch_size: int = 500) -> Dict[str, int]:
+    """
+    Bulk update records where each row carries its own values, one request per batch.
+    
+    Uses the bulk_update RPC (database/bulk_update.sql), which applies a whole batch
+    in a single UPDATE ... FROM statement. Every row must contain id_column and the
+    same set of columns.
+    
+    Args:
+        table_name (str): Name of the table to update
+        id_column (str): Name of the ID column
+        rows (List[Dict[str, Any]]): Rows of column-value pairs, each including id_column
+        batch_size (int): Number of rows sent in each request
         
-        try:
-            # Build the query for batch update
-            query = supabase.table(table_name).update(updates)
-            
-            # Apply filter for this batch
-            query = query.in_(id_column, batch_ids)
-            
-            # Execute the update
-            response = query.execute()
-            
-            # Count successful updates (response.data contains updated records)
-            success_count += len(response.data) if response.data else 0
-            
-        except Exception as e:
-            st.error(f"Error updating batch {i//batch_size + 1}: {str(e)}")
-            failed_count += len(batch_ids)
+    Returns:
+        Dict[str, int]: Results with 'success' and 'failed' counts
+    """
+    def update_batch(batch_rows):
+        response = supabase.rpc("bulk_update", {
+            "p_table": table_name,
+            "p_key": id_column,
+            "p_rows": batch_rows
+        }).execute()
+        
+        # The function returns the number of updated rows
+        return response.data or 0
     
-    return {
-        "success": success_count,
-        "failed": failed_count
-    }
+    # Process in batches to keep request payloads bounded
+    return _run_batches(rows, batch_size, update_batch, "updating")
 
 def bulk_delete_records(table_name: str, record_ids: List[str], id_column: str, 
                        batch_size: int = 100) -> Dict[str, int]:
@@ -65,34 +138,15 @@ def bulk_delete_records(table_name: str, record_ids: List[str], id_column: str,
     Returns:
         Dict[str, int]: Results with 'success' and 'failed' counts
     """
-    success_count = 0
-    failed_count = 0
-    
-    # Process in batches to avoid timeouts
-    for i in range(0, len(record_ids), batch_size):
-        batch_ids = record_ids[i:i + batch_size]
+    def delete_batch(batch_ids):
+        # Build the query for batch delete and apply filter for this batch
+        response = supabase.table(table_name).delete(count="exact", returning="minimal").in_(id_column, batch_ids).execute()
         
-        try:
-            # Build the query for batch delete
-            query = supabase.table(table_name).delete()
-            
-            # Apply filter for this batch
-            query = query.in_(id_column, batch_ids)
-            
-            # Execute the delete
-            response = query.execute()
-            
-            # Count successful deletions
-            success_count += len(response.data) if response.data else 0
-            
-        except Exception as e:
-            st.error(f"Error deleting batch {i//batch_size + 1}: {str(e)}")
-            failed_count += len(batch_ids)
+        # Count successful deletions
+        return _affected_rows(response)
     
-    return {
-        "success": success_count,
-        "failed": failed_count
-    }
+    # Process in batches to avoid timeouts
+    return _run_batches(record_ids, batch_size, delete_batch, "deleting")
 
 def bulk_insert_records(table_name: str, records: List[Dict[str, Any]], 
                        batch_size: int = 100) -> Dict[str, int]:
@@ -107,28 +161,14 @@ def bulk_insert_records(table_name: str, records: List[Dict[str, Any]],
     Returns:
         Dict[str, int]: Results with 'success' and 'failed' counts
     """
-    success_count = 0
-    failed_count = 0
-    
-    # Process in batches to avoid timeouts
-    for i in range(0, len(records), batch_size):
-        batch_records = records[i:i + batch_size]
+    def insert_batch(batch_records):
+        response = supabase.table(table_name).insert(batch_records, count="exact", returning="minimal").execute()
         
-        try:
-            # Insert the batch
-            response = supabase.table(table_name).insert(batch_records).execute()
-            
-            # Count successful insertions
-            success_count += len(response.data) if response.data else 0
-            
-        except Exception as e:
-            st.error(f"Error inserting batch {i//batch_size + 1}: {str(e)}")
-            failed_count += len(batch_records)
+        # Count successful insertions
+        return _affected_rows(response)
     
-    return {
-        "success": success_count,
-        "failed": failed_count
-    }
+    # Process in batches to avoid timeouts
+    return _run_batches(records, batch_size, insert_batch, "inserting")
 
 def bulk_payment_status_update(bill_ids: List[str], new_status: str, 
                              paid_date: str = None, paid_amount: float = None) -> Dict[str, int]:
@@ -192,24 +232,38 @@ def validate_bulk_operation(table_name: str, operation: str, records: List[Dict[
     # Table-specific validation
     if table_name == "bills":
         required_fields = ["psid", "bill_month"] if operation == "insert" else ["psid"]
-        for i, record in enumerate(records):
-            for field in required_fields:
-                if field not in record or not record[field]:
-                    errors.append(f"Record {i+1}: Missing required field '{field}'")
-    
     elif table_name == "survey_units":
         required_fields = ["survey_id"] if operation == "update" else ["survey_id", "city_district", "uc_name"]
-        for i, record in enumerate(records):
-            for field in required_fields:
-                if field not in record or not record[field]:
-                    errors.append(f"Record {i+1}: Missing required field '{field}'")
-    
     elif table_name == "staff":
         required_fields = ["username"] if operation == "update" else ["username", "full_name", "role"]
-        for i, record in enumerate(records):
-            for field in required_fields:
-                if field not in record or not record[field]:
-                    errors.append(f"Record {i+1}: Missing required field '{field}'")
+    else:
+        return errors
+    
+    # Check every record at once: a field is missing if its column is absent,
+    # the value is null/NaN (blank CSV cell) or falsy ("", 0)
+    values = pd.DataFrame.from_records(records).reindex(columns=required_fields)
+    missing = values.isna().to_numpy() | ~values.astype(bool).to_numpy()
+    
+    # Row-major order, so errors are listed record by record as before
+    flagged = set()
+    for i, j in zip(*np.nonzero(missing)):
+        errors.append(f"Record {i+1}: Missing required field '{required_fields[j]}'")
+        flagged.add((int(i), required_fields[j]))
+    
+    # New staff rows are also checked against StaffModel (lengths, types) in one batch;
+    # blank CSV cells (NaN) are passed as None like an empty form field
+    if table_name == "staff" and operation == "insert":
+        frame = pd.DataFrame.from_records(records)
+        rows = frame.astype(object).where(frame.notna(), None).to_dict("records")
+        try:
+            _STAFF_RECORDS.validate_python(rows)
+        except ValidationError as e:
+            for error in e.errors():
+                i, field = error["loc"][0], error["loc"][1] if len(error["loc"]) > 1 else None
+                # Missing fields were already reported above
+                if error["type"] == "missing" or (i, field) in flagged:
+                    continue
+                errors.append(f"Record {i+1}: Invalid field '{field}': {error['msg']}")
     
     return errors
 
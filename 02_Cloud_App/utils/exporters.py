@@ -5,9 +5,55 @@ Provides functions to export data to CSV and Excel formats.
 import streamlit as st
 import pandas as pd
 import io
+import gzip
+import hashlib
+import pickle
 from datetime import datetime
+from importlib.util import find_spec
 from typing import Optional
+from services.db import supabase
+from services.repository import apply_filters
+from utils.fast_xlsx import stream_xlsx
 
+# xlsxwriter serializes much faster than openpyxl; fall back when it is not installed
+_EXCEL_ENGINE = "xlsxwriter" if find_spec("xlsxwriter") else "openpyxl"
+
+# Beyond this many rows Excel exports skip the per-cell writers and stream the sheet XML (utils/fast_xlsx.py)
+FAST_XLSX_MIN_ROWS = 50000
+
+def _write_xlsx_openpyxl(df: pd.DataFrame, buffer, sheet_name: str):
+    """
+    Write a DataFrame with openpyxl's write-only mode: rows are streamed to the sheet
+    as they are appended instead of building a Cell object for every value
+    (which is what pd.ExcelWriter does with openpyxl).
+    """
+    from openpyxl import Workbook
+    
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    worksheet.append([str(col) for col in df.columns])
+    
+    # openpyxl has no notion of NaN/NA/NaT; write them as empty cells like to_excel does
+    values = df.astype(object).where(df.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        worksheet.append(row)
+    
+    workbook.save(buffer)
+
+def _frame_digest(df: pd.DataFrame) -> str:
+    """
+    Content hash of a whole DataFrame, used as the export cache key.
+    (st.cache_data's default hash only samples the rows of large frames.)
+    """
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=True).values
+    except TypeError:
+        # Unhashable cells (e.g. JSON lists/dicts); fall back to the pickled frame
+        return hashlib.sha1(pickle.dumps(df)).hexdigest()
+    return hashlib.sha1(row_hashes.tobytes() + str(list(df.columns)).encode()).hexdigest()
+
+# Download buttons are rendered on every rerun, so reuse the serialized bytes while the data is unchanged
+@st.cache_data(max_entries=16, show_spinner=False, hash_funcs={pd.DataFrame: _frame_digest})
 def export_to_csv(df: pd.DataFrame, filename: Optional[str] = None) -> bytes:
     """
     Export a DataFrame to CSV format.
@@ -23,13 +69,13 @@ def export_to_csv(df: pd.DataFrame, filename: Optional[str] = None) -> bytes:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"export_{timestamp}.csv"
     
-    # Convert DataFrame to CSV
-    csv_buffer = io.StringIO()
-    df.to_csv(csv_buffer, index=False, encoding='utf-8-sig')
-    csv_data = csv_buffer.getvalue()
+    # Convert DataFrame to CSV, encoded (with BOM) straight into a bytes buffer in row chunks
+    csv_buffer = io.BytesIO()
+    df.to_csv(csv_buffer, index=False, encoding='utf-8-sig', chunksize=50000)
     
-    return csv_data.encode('utf-8-sig')
+    return csv_buffer.getvalue()
 
+@st.cache_data(max_entries=16, show_spinner=False, hash_funcs={pd.DataFrame: _frame_digest})
 def export_to_excel(df: pd.DataFrame, filename: Optional[str] = None, 
                    sheet_name: str = "Data") -> bytes:
     """
@@ -47,39 +93,113 @@ def export_to_excel(df: pd.DataFrame, filename: Optional[str] = None,
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"export_{timestamp}.xlsx"
     
+    # Excel cannot store timezone-aware datetimes, so drop the offset (values stay in UTC)
+    tz_columns = df.select_dtypes(include=['datetimetz']).columns
+    if len(tz_columns):
+        df = df.assign(**{col: df[col].dt.tz_localize(None) for col in tz_columns})
+    
     # Convert DataFrame to Excel
     excel_buffer = io.BytesIO()
-    with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
+    if len(df) > FAST_XLSX_MIN_ROWS:
+        stream_xlsx(df, excel_buffer, sheet_name)
+    elif _EXCEL_ENGINE == "openpyxl":
+        _write_xlsx_openpyxl(df, excel_buffer, sheet_name)
+    else:
+        with pd.ExcelWriter(excel_buffer, engine=_EXCEL_ENGINE) as writer:
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
     excel_data = excel_buffer.getvalue()
     
     return excel_data
 
-def download_button_csv(df: pd.DataFrame, filename: Optional[str] = None, 
-                       button_text: str = "Download CSV"):
+def stream_table_csv(table_name: str, columns: str = "*", filters=None, 
+                     order_by: Optional[str] = None, chunk_size: int = 10000,
+                     key_column: Optional[str] = None) -> bytes:
+    """
+    Export a whole (filtered) table to CSV, pulling it from Supabase in chunks.
+    
+    Only one chunk is held as a DataFrame at a time, so large exports never
+    build the full table in pandas.
+    
+    Args:
+        table_name (str): Name of the table
+        columns (str): Columns to select
+        filters (dict | list): Filter conditions (see repository.apply_filters)
+        order_by (str, optional): Column to order by
+        chunk_size (int): Number of rows asked for per request (PostgREST may return
+            fewer, capped at its max-rows setting, so only an empty chunk ends the export)
+        key_column (str, optional): Unique column ordered on after order_by, so rows that
+            tie on order_by can't be duplicated or skipped where chunks meet
+        
+    Returns:
+        bytes: CSV data as bytes (empty if no rows matched)
+    """
+    csv_buffer = io.BytesIO()
+    offset = 0
+    
+    while True:
+        query = apply_filters(supabase.table(table_name).select(columns), filters)
+        if order_by:
+            query = query.order(order_by)
+        if key_column:
+            query = query.order(key_column)
+        batch = query.range(offset, offset + chunk_size - 1).execute().data
+        
+        if not batch:
+            break
+        
+        # BOM once up front, header only on the first chunk
+        chunk_csv = pd.DataFrame(batch).to_csv(index=False, header=(offset == 0))
+        csv_buffer.write(chunk_csv.encode('utf-8-sig' if offset == 0 else 'utf-8'))
+        offset += len(batch)
+    
+    return csv_buffer.getvalue()
+
+def download_button_csv(df: Optional[pd.DataFrame], filename: Optional[str] = None, 
+                       button_text: str = "Download CSV", table_name: Optional[str] = None, 
+                       columns: str = "*", filters=None, order_by: Optional[str] = None,
+                       compress: bool = False, key_column: Optional[str] = None):
     """
     Create a Streamlit download button for CSV data.
+    With compress=True the file is served gzipped as .csv.gz (CSV text typically
+    shrinks 5-10x, so large exports download much faster).
     
     Args:
-        df (pd.DataFrame): DataFrame to export
+        df (pd.DataFrame, optional): DataFrame to export; pass None with table_name to stream the table instead
         filename (str, optional): Filename for the export
         button_text (str): Text for the download button
+        table_name (str, optional): Table to stream via stream_table_csv when df is None
+        columns (str): Columns to select when streaming
+        filters (dict | list): Filter conditions when streaming
+        order_by (str, optional): Column to order by when streaming
+        key_column (str, optional): Unique tiebreaker column when streaming (see stream_table_csv)
+        compress (bool): Serve the CSV gzip-compressed (level 1, fast)
     """
-    if df.empty:
+    if df is None and table_name:
+        csv_data = stream_table_csv(table_name, columns, filters, order_by, key_column=key_column)
+        if not csv_data:
+            st.warning("No data to export.")
+            return
+    elif df is None or df.empty:
         st.warning("No data to export.")
         return
-    
-    csv_data = export_to_csv(df, filename)
+    else:
+        csv_data = export_to_csv(df, filename)
     
     if filename is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"export_{timestamp}.csv"
     
+    mime = "text/csv"
+    if compress:
+        csv_data = gzip.compress(csv_data, compresslevel=1)
+        filename = f"{filename}.gz"
+        mime = "application/gzip"
+    
     st.download_button(
         label=button_text,
         data=csv_data,
         file_name=filename,
-        mime="text/csv"
+        mime=mime
     )
 
 def download_button_excel(df: pd.DataFrame, filename: Optional[str] = None, 
@@ -123,24 +243,22 @@ def export_bill_summary(bills_df: pd.DataFrame) -> pd.DataFrame:
     if bills_df.empty:
         return pd.DataFrame()
     
-    # Group by payment status and calculate summary statistics
-    summary = bills_df.groupby('payment_status').agg({
-        'amount_due': ['count', 'sum', 'mean'],
-        'paid_amount': 'sum'
-    }).round(2)
-    
-    # Flatten column names
-    summary.columns = ['_'.join(col).strip() for col in summary.columns]
-    summary = summary.reset_index()
-    
-    # Add overall totals
-    totals = pd.DataFrame([{
-        'payment_status': 'TOTAL',
-        'amount_due_count': bills_df['amount_due'].count(),
-        'amount_due_sum': bills_df['amount_due'].sum(),
-        'amount_due_mean': bills_df['amount_due'].mean(),
-        'paid_amount_sum': bills_df['paid_amount'].sum() if 'paid_amount' in bills_df.columns else 0
-    }])
+    # One named-aggregation pass grouped on categorical codes; dropna=False keeps bills
+    # without a status so the totals below still cover every bill
+    per_status = bills_df.groupby(bills_df['payment_status'].astype('category'), observed=True, dropna=False).agg(
+        amount_due_count=('amount_due', 'count'),
+        amount_due_sum=('amount_due', 'sum'),
+        amount_due_mean=('amount_due', 'mean'),
+        paid_amount_sum=('paid_amount', 'sum')
+    )
+    summary = per_status.round(2).reset_index()
+    summary = summary[summary['payment_status'].notna()]
+    
+    # Overall totals from the per-status sums instead of another pass over the bills
+    totals = per_status[['amount_due_count', 'amount_due_sum', 'paid_amount_sum']].sum()
+    count = totals['amount_due_count']
+    totals['amount_due_mean'] = totals['amount_due_sum'] / count if count else float('nan')
+    totals = totals.to_frame().T.astype({'amount_due_count': 'int64'}).assign(payment_status='TOTAL')
     
     # Combine summary and totals
     result = pd.concat([summary, totals], ignore_index=True)
@@ -160,12 +278,16 @@ def export_consumer_summary(consumers_df: pd.DataFrame) -> pd.DataFrame:
     if consumers_df.empty:
         return pd.DataFrame()
     
-    # Create summary by city/district
+    # Create summary by city/district (grouped on categorical codes; active consumers are
+    # counted with the native sum over an int8 flag instead of a Python lambda per group)
     if 'city_district' in consumers_df.columns:
-        summary = consumers_df.groupby('city_district').agg({
-            'survey_id': 'count',
-            'is_active_portal': lambda x: sum(x == True)
-        }).reset_index()
+        summary = consumers_df.assign(
+            city_district=consumers_df['city_district'].astype('category'),
+            _active=consumers_df['is_active_portal'].eq(True).fillna(False).astype('int8')
+        ).groupby('city_district', observed=True, as_index=False).agg(
+            total=('survey_id', 'count'),
+            active=('_active', 'sum')
+        )
         
         summary.columns = ['City/District', 'Total Consumers', 'Active Consumers']
         summary['Inactive Consumers'] = summary['Total Consumers'] - summary['Active Consumers']
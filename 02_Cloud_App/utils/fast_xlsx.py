@@ -0,0 +1,150 @@
+"""
+Minimal streaming XLSX writer for very large exports.
+Writes the sheet XML straight into a deflated zip archive in row chunks, without
+building a cell object per value, so memory and time stay proportional to one chunk.
+"""
+import math
+import re
+import zipfile
+import numpy as np
+import pandas as pd
+from xml.sax.saxutils import escape
+
+# Excel's hard limit (header row included)
+MAX_XLSX_ROWS = 1048576
+
+# Rows converted to XML per pass
+CHUNK_ROWS = 10000
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{sheet_name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# Style 0 is the default, style 1 the built-in date-time format (numFmtId 22)
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="22" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_END = '</sheetData></worksheet>'
+
+_EMPTY = '<c/>'
+
+# Control characters are not allowed in XML 1.0 text
+_ILLEGAL_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Excel's day zero for the 1900 date system
+_EXCEL_EPOCH = np.datetime64("1899-12-30")
+
+def _text_cell(value) -> str:
+    text = escape(_ILLEGAL_XML.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+def _number_cell(value: float, style: str = '') -> str:
+    if not math.isfinite(value):
+        return _EMPTY
+    return f'<c{style}><v>{value!r}</v></c>'
+
+def _column_cells(series: pd.Series) -> list:
+    """
+    Cell XML for every value of one column chunk, chosen once per column by dtype.
+    Missing values become empty cells.
+    """
+    if pd.api.types.is_bool_dtype(series.dtype):
+        missing = series.isna().to_numpy()
+        values = series.astype(object).to_numpy()
+        return [_EMPTY if na else f'<c t="b"><v>{int(bool(v))}</v></c>' for na, v in zip(missing, values)]
+    
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        # Day fractions since the Excel epoch (tz-aware values are written in UTC)
+        stamps = series.to_numpy(dtype="datetime64[ns]", na_value=np.datetime64("NaT"))
+        serials = (stamps - _EXCEL_EPOCH) / np.timedelta64(1, "D")
+        return [_number_cell(v, ' s="1"') for v in serials.tolist()]
+    
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        numbers = series.to_numpy(dtype="float64", na_value=np.nan)
+        return [_number_cell(v) for v in numbers.tolist()]
+    
+    missing = series.isna().to_numpy()
+    values = series.astype(object).to_numpy()
+    return [_EMPTY if na else _text_cell(v) for na, v in zip(missing, values)]
+
+def _row(number: int, cells) -> str:
+    return f'<row r="{number}">{"".join(cells)}</row>'
+
+def stream_xlsx(df: pd.DataFrame, out, sheet_name: str = "Data"):
+    """
+    Write a DataFrame as a single-sheet .xlsx into a binary file-like object.
+    
+    Strings are written as inline strings, numbers and booleans as values and
+    datetimes as date-time formatted serials, matching what to_excel produces.
+    
+    Args:
+        df (pd.DataFrame): DataFrame to export
+        out: Writable binary file-like object (e.g. io.BytesIO)
+        sheet_name (str): Name of the Excel sheet
+    """
+    if len(df) + 1 > MAX_XLSX_ROWS:
+        raise ValueError(f"This sheet is too large! Your sheet size is: {len(df)}, {len(df.columns)} "
+                         f"Max sheet size is: {MAX_XLSX_ROWS - 1}, 16384")
+    
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _ROOT_RELS)
+        archive.writestr("xl/workbook.xml", _WORKBOOK.format(sheet_name=escape(sheet_name, {'"': "&quot;"})))
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        archive.writestr("xl/styles.xml", _STYLES)
+    
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(_SHEET_START.encode("utf-8"))
+            sheet.write(_row(1, [_text_cell(col) for col in df.columns]).encode("utf-8"))
+    
+            for start in range(0, len(df), CHUNK_ROWS):
+                chunk = df.iloc[start:start + CHUNK_ROWS]
+                columns = [_column_cells(chunk.iloc[:, i]) for i in range(chunk.shape[1])]
+                rows = [_row(start + offset + 2, cells) for offset, cells in enumerate(zip(*columns))]
+                sheet.write("".join(rows).encode("utf-8"))
+    
+            sheet.write(_SHEET_END.encode("utf-8"))
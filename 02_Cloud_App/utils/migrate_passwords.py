@@ -1,5 +1,6 @@
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 # Add the parent directory to the path so we can import our modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,28 +19,39 @@ def migrate_passwords():
         
         print(f"Found {len(staff_members)} staff members to migrate.")
         
-        migrated_count = 0
+        pending = []
         for staff in staff_members:
             # Skip if already hashed (check if password looks like a hash)
             if staff['password'] and (staff['password'].startswith('$2b$') or len(staff['password']) > 50):
                 print(f"Skipping {staff['username']} - password already hashed")
-                continue
-                
-            # Hash the plain text password
-            if staff['password']:
-                hashed_password = hash_password(staff['password'])
-                
-                # Update the database with the hashed password
-                update_response = supabase.table("staff").update({
-                    "password": hashed_password  # Store hashed password in the password field
-                }).eq("id", staff['id']).execute()
-                
-                print(f"Migrated password for {staff['username']}")
-                migrated_count += 1
+            elif staff['password']:
+                pending.append(staff)
             else:
                 print(f"Skipping {staff['username']} - no password set")
         
-        print(f"Successfully migrated {migrated_count} passwords.")
+        if pending:
+            # bcrypt is deliberately slow and CPU-bound, so hash on every core at once
+            with ProcessPoolExecutor() as executor:
+                hashed_passwords = list(executor.map(hash_password, [staff['password'] for staff in pending], chunksize=8))
+            
+            # Store all hashed passwords with one request (database/bulk_update.sql)
+            update_response = supabase.rpc("bulk_update", {
+                "p_table": "staff",
+                "p_key": "id",
+                "p_rows": [{"id": staff['id'], "password": hashed} for staff, hashed in zip(pending, hashed_passwords)]
+            }).execute()
+            
+            # The function returns the number of updated rows; fewer than sent means some
+            # rows were not written (e.g. blocked by RLS or no matching id)
+            updated = update_response.data or 0
+            if updated != len(pending):
+                print(f"Error migrating passwords: updated {updated} of {len(pending)} staff rows.")
+                return False
+            
+            for staff in pending:
+                print(f"Migrated password for {staff['username']}")
+        
+        print(f"Successfully migrated {len(pending)} passwords.")
         
     except Exception as e:
         print(f"Error migrating passwords: {e}")
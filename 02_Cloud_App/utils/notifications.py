@@ -3,7 +3,6 @@ Notification system for the billing system.
 Provides in-app notifications and activity tracking.
 """
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Optional
 from services.db import supabase
@@ -16,6 +15,27 @@ NOTIFICATION_TYPES = {
     "error": "❌"
 }
 
+# (type, is_read) -> (icon, background colour), shared by the notification list and the Notifications page
+NOTIFICATION_STYLES = {
+    (notification_type, is_read): (NOTIFICATION_TYPES[notification_type], read_bg if is_read else unread_bg)
+    for notification_type, (read_bg, unread_bg) in {
+        "info": ("#e3f2fd", "#bbdefb"),
+        "success": ("#e8f5e9", "#c8e6c9"),
+        "warning": ("#fff3e0", "#ffe0b2"),
+        "error": ("#ffebee", "#ffcdd2")
+    }.items()
+    for is_read in (True, False)
+}
+DEFAULT_NOTIFICATION_STYLE = ("ℹ️", "#f5f5f5")
+
+# Rows per insert request when notifying many users at once
+INSERT_BATCH_SIZE = 500
+
+def _clear_notification_caches():
+    """Drops the cached notification reads after a write so the change shows up on the next rerun."""
+    get_user_notifications.clear()
+    get_unread_notification_count.clear()
+
 def create_notification(user_id: int, message: str, notification_type: str = "info", 
                        related_entity: str = None, entity_id: str = None) -> bool:
     """
@@ -43,6 +63,7 @@ def create_notification(user_id: int, message: str, notification_type: str = "in
         }
         
         response = supabase.table("notifications").insert(notification_data).execute()
+        _clear_notification_caches()
         return True if response.data else False
         
     except Exception as e:
@@ -50,6 +71,8 @@ def create_notification(user_id: int, message: str, notification_type: str = "in
         # st.error(f"Error creating notification: {str(e)}")
         return False
 
+# Read on every rerun (sidebar badge, notification lists), so cached briefly; writes below clear it
+@st.cache_data(ttl=15, show_spinner=False)
 def get_user_notifications(user_id: int, limit: int = 50, unread_only: bool = False) -> List[Dict]:
     """
     Get notifications for a user.
@@ -90,6 +113,7 @@ def mark_notification_as_read(notification_id: int) -> bool:
     """
     try:
         response = supabase.table("notifications").update({"is_read": True}).eq("id", notification_id).execute()
+        _clear_notification_caches()
         return True if response.data else False
         
     except Exception as e:
@@ -97,6 +121,29 @@ def mark_notification_as_read(notification_id: int) -> bool:
         # st.error(f"Error marking notification as read: {str(e)}")
         return False
 
+def mark_notifications_as_read(notification_ids: List[int]) -> bool:
+    """
+    Mark several notifications as read with a single update.
+    
+    Args:
+        notification_ids (List[int]): IDs of the notifications
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if not notification_ids:
+        return True
+    
+    try:
+        response = supabase.table("notifications").update({"is_read": True}).in_("id", notification_ids).execute()
+        _clear_notification_caches()
+        return True if response.data else False
+        
+    except Exception as e:
+        # Silently fail if notifications table doesn't exist
+        # st.error(f"Error marking notifications as read: {str(e)}")
+        return False
+
 def mark_all_notifications_as_read(user_id: int) -> bool:
     """
     Mark all notifications for a user as read.
@@ -109,6 +156,7 @@ def mark_all_notifications_as_read(user_id: int) -> bool:
     """
     try:
         response = supabase.table("notifications").update({"is_read": True}).eq("user_id", user_id).execute()
+        _clear_notification_caches()
         return True if response.data else False
         
     except Exception as e:
@@ -128,6 +176,7 @@ def delete_notification(notification_id: int) -> bool:
     """
     try:
         response = supabase.table("notifications").delete().eq("id", notification_id).execute()
+        _clear_notification_caches()
         return True if response.data else False
         
     except Exception as e:
@@ -135,6 +184,7 @@ def delete_notification(notification_id: int) -> bool:
         # st.error(f"Error deleting notification: {str(e)}")
         return False
 
+@st.cache_data(ttl=15, show_spinner=False)
 def get_unread_notification_count(user_id: int) -> int:
     """
     Get count of unread notifications for a user.
@@ -146,8 +196,9 @@ def get_unread_notification_count(user_id: int) -> int:
         int: Count of unread notifications
     """
     try:
-        response = supabase.table("notifications").select("count", count="exact").eq("user_id", user_id).eq("is_read", False).execute()
-        return response.count if hasattr(response, 'count') else len(response.data)
+        # HEAD request: PostgREST answers with the count in Content-Range and sends no rows
+        response = supabase.table("notifications").select("id", count="exact", head=True).eq("user_id", user_id).eq("is_read", False).execute()
+        return response.count or 0
         
     except Exception as e:
         # Silently fail if notifications table doesn't exist to prevent errors
@@ -183,18 +234,18 @@ def display_notifications(user_id: int, limit: int = 10):
     if not notifications:
         return
     
+    # Unread notifications shown here, marked read together after rendering
+    to_mark = []
+    
+    # The whole list is sent to the browser as one markdown element
+    parts = []
+    
     for notification in notifications[:limit]:
-        icon = NOTIFICATION_TYPES.get(notification['type'], "ℹ️")
-        timestamp = pd.to_datetime(notification['created_at']).strftime("%Y-%m-%d %H:%M")
-        
-        bg_color = {
-            "info": "#e3f2fd" if notification['is_read'] else "#bbdefb",
-            "success": "#e8f5e9" if notification['is_read'] else "#c8e6c9",
-            "warning": "#fff3e0" if notification['is_read'] else "#ffe0b2",
-            "error": "#ffebee" if notification['is_read'] else "#ffcdd2"
-        }.get(notification['type'], "#f5f5f5")
+        icon, bg_color = NOTIFICATION_STYLES.get((notification['type'], bool(notification['is_read'])), DEFAULT_NOTIFICATION_STYLE)
+        # created_at is ISO 8601 text ("2024-05-01T09:30:12..."), so "%Y-%m-%d %H:%M" is just its first 16 characters
+        timestamp = notification['created_at'][:16].replace("T", " ")
         
-        st.markdown(f"""
+        parts.append(f"""
         <div style="background-color: {bg_color}; padding: 10px; border-radius: 5px; margin-bottom: 5px;">
             <div style="display: flex; justify-content: space-between; align-items: center;">
                 <span><strong>{icon}</strong> {notification['message']}</span>
@@ -202,11 +253,14 @@ def display_notifications(user_id: int, limit: int = 10):
             </div>
             {f"<div style='font-size: 0.8em; color: #666; margin-top: 5px;'>Related to: {notification['related_entity']} #{notification['entity_id']}</div>" if notification['related_entity'] else ""}
         </div>
-        """, unsafe_allow_html=True)
+        """)
         
         # Mark as read when viewed
         if not notification['is_read']:
-            mark_notification_as_read(notification['id'])
+            to_mark.append(notification['id'])
+    
+    st.markdown("".join(parts), unsafe_allow_html=True)
+    mark_notifications_as_read(to_mark)
 
 def create_system_notification(message: str, notification_type: str = "info", 
                              related_entity: str = None, entity_id: str = None) -> bool:
@@ -227,13 +281,27 @@ def create_system_notification(message: str, notification_type: str = "info",
         users_response = supabase.table("staff").select("id").eq("is_active", True).execute()
         user_ids = [user['id'] for user in users_response.data] if users_response.data else []
         
-        # Create notification for each user
+        # One multi-row insert per batch instead of a request per user
+        created_at = datetime.now().isoformat()
+        rows = [{
+            "user_id": user_id,
+            "message": message,
+            "type": notification_type,
+            "related_entity": related_entity,
+            "entity_id": entity_id,
+            "is_read": False,
+            "created_at": created_at
+        } for user_id in user_ids]
+        
         success_count = 0
-        for user_id in user_ids:
-            if create_notification(user_id, message, notification_type, related_entity, entity_id):
-                success_count += 1
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            response = supabase.table("notifications").insert(
+                rows[start:start + INSERT_BATCH_SIZE], count="exact", returning="minimal"
+            ).execute()
+            success_count += response.count or 0
         
-        return success_count == len(user_ids)
+        _clear_notification_caches()
+        return success_count == len(rows)
         
     except Exception as e:
         # Silently fail if notifications table doesn't exist
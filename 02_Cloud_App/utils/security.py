@@ -2,50 +2,61 @@
 Security utilities for the billing system.
 Provides password hashing and validation functions.
 """
+import os
 import bcrypt
-import streamlit as st
+from typing import Union
 
-def hash_password(password: str) -> str:
+# bcrypt work factor for new hashes (each extra round doubles the cost of hashing and of
+# every login check); 10 keeps logins fast, raise it via the environment as hardware gets faster.
+# Existing hashes keep the rounds they were created with.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "10"))
+
+# Special characters a secure password must include one of (built once, set membership)
+_SPECIAL_CHARS = frozenset("!@#$%^&*()_+-=[]{}|;:,.<>?")
+
+def _to_bytes(value: Union[str, bytes]) -> bytes:
+    """UTF-8 bytes for bcrypt; values that are already bytes are passed through unchanged."""
+    return value if isinstance(value, bytes) else value.encode('utf-8')
+
+def hash_password(password: Union[str, bytes]) -> str:
     """
     Hash a password using bcrypt.
     
     Args:
-        password (str): Plain text password
+        password (Union[str, bytes]): Plain text password
         
     Returns:
         str: Hashed password
     """
     # Convert password to bytes
-    password_bytes = password.encode('utf-8')
+    password_bytes = _to_bytes(password)
     
     # Generate salt and hash password
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     
     # Return as string
     return hashed.decode('utf-8')
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def verify_password(plain_password: Union[str, bytes], hashed_password: Union[str, bytes]) -> bool:
     """
     Verify a plain password against a hashed password.
     
+    A malformed hash is not treated as a wrong password: the error is left to the
+    caller, so a corrupt record can be told apart from a failed login.
+    
     Args:
-        plain_password (str): Plain text password
-        hashed_password (str): Hashed password from database
+        plain_password (Union[str, bytes]): Plain text password
+        hashed_password (Union[str, bytes]): Hashed password from database
         
     Returns:
         bool: True if password matches, False otherwise
-    """
-    try:
-        # Convert to bytes
-        plain_bytes = plain_password.encode('utf-8')
-        hashed_bytes = hashed_password.encode('utf-8')
         
-        # Check if password matches
-        return bcrypt.checkpw(plain_bytes, hashed_bytes)
-    except Exception as e:
-        st.error(f"Password verification error: {e}")
-        return False
+    Raises:
+        ValueError: If hashed_password is not a valid bcrypt hash
+    """
+    # Check if password matches (checkpw compares the hashes in constant time)
+    return bcrypt.checkpw(_to_bytes(plain_password), _to_bytes(hashed_password))
 
 def is_password_secure(password: str) -> bool:
     """
@@ -57,25 +68,12 @@ def is_password_secure(password: str) -> bool:
     Returns:
         bool: True if password is secure, False otherwise
     """
-    # Minimum 8 characters
-    if len(password) < 8:
-        return False
-    
-    # Must contain at least one uppercase letter
-    if not any(c.isupper() for c in password):
-        return False
-    
-    # Must contain at least one lowercase letter
-    if not any(c.islower() for c in password):
-        return False
-    
-    # Must contain at least one digit
-    if not any(c.isdigit() for c in password):
-        return False
-    
-    # Must contain at least one special character
-    special_chars = "!@#$%^&*()_+-=[]{}|;:,.<>?"
-    if not any(c in special_chars for c in password):
-        return False
-    
-    return True
\ No newline at end of file
+    # At least 8 characters with an uppercase letter, a lowercase letter and a digit
+    # (str methods, so letters and digits of any script count) and one special character
+    return (
+        len(password) >= 8
+        and any(c.isupper() for c in password)
+        and any(c.islower() for c in password)
+        and any(c.isdigit() for c in password)
+        and not _SPECIAL_CHARS.isdisjoint(password)
+    )
\ No newline at end of file
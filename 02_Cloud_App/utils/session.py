@@ -9,18 +9,25 @@ from datetime import datetime, timedelta
 # Session timeout duration (30 minutes)
 SESSION_TIMEOUT = 30 * 60  # 30 minutes in seconds
 
+# Activity is timed with the monotonic clock (no wall-clock jumps, no syscall on Linux);
+# session state lives in the server process, so the values are always comparable
+_monotonic = time.monotonic
+
+# Reruns within this many seconds of the last expiry check skip it (rapid widget changes)
+CHECK_INTERVAL = 1.0
+
 def init_session():
     """
     Initialize session state variables for session management.
     """
     if "last_activity" not in st.session_state:
-        st.session_state["last_activity"] = time.time()
+        st.session_state["last_activity"] = _monotonic()
 
 def update_last_activity():
     """
     Update the last activity timestamp.
     """
-    st.session_state["last_activity"] = time.time()
+    st.session_state["last_activity"] = _monotonic()
 
 def is_session_expired():
     """
@@ -32,7 +39,7 @@ def is_session_expired():
     if "last_activity" not in st.session_state:
         return False
     
-    elapsed_time = time.time() - st.session_state["last_activity"]
+    elapsed_time = _monotonic() - st.session_state["last_activity"]
     return elapsed_time > SESSION_TIMEOUT
 
 def check_session_timeout():
@@ -42,12 +49,16 @@ def check_session_timeout():
     """
     init_session()
     
+    now = _monotonic()
+    if now - st.session_state.get("_last_timeout_check", float("-inf")) < CHECK_INTERVAL:
+        return
+    st.session_state["_last_timeout_check"] = now
+    
     if is_session_expired():
         # Session expired, logout user
         st.warning("Your session has expired due to inactivity. Please log in again.")
         # Clear all session state
-        for key in list(st.session_state.keys()):
-            del st.session_state[key]
+        st.session_state.clear()
         st.stop()
 
 def get_session_duration():
@@ -60,7 +71,7 @@ def get_session_duration():
     if "last_activity" not in st.session_state:
         return 0
     
-    return int(time.time() - st.session_state["last_activity"])
+    return int(_monotonic() - st.session_state["last_activity"])
 
 def format_session_time(seconds):
     """
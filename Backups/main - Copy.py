@@ -2,7 +2,7 @@ import streamlit as st
 from supabase import create_client, Client
 from dotenv import load_dotenv
 import os
-import time
+import numpy as np
 import pandas as pd
 
 # ---------------------------------------------------------
@@ -41,15 +41,16 @@ if "user_name" not in st.session_state:
 # ---------------------------------------------------------
 def login_user(username, password):
     try:
-        response = supabase.table("staff").select("*").eq("username", username).eq("password", password).execute()
-        if response.data:
-            user = response.data[0]
+        # The bcrypt check runs in Postgres (database/auth_login.sql); the hash never comes back
+        response = supabase.rpc("auth_login", {"p_user": username, "p_pw": password}).execute()
+        user = response.data[0] if response.data else None
+        if user and user.get('ok'):
             if user['is_active']:
                 st.session_state["logged_in"] = True
                 st.session_state["user_role"] = user['role']
                 st.session_state["user_name"] = user['full_name']
-                st.success("Login Successful!")
-                time.sleep(0.5)
+                # A toast survives the rerun, so the worker isn't held up to show a message
+                st.toast("Login Successful!")
                 st.rerun()
             else:
                 st.error("🚫 Account Locked.")
@@ -62,6 +63,20 @@ def logout():
     st.session_state["logged_in"] = False
     st.rerun()
 
+def highlight_status(col):
+    # Styler.apply hands us the whole column, so color it in one vectorized pass
+    return np.where(col.eq('PAID'), 'background-color: #d4edda', 'background-color: #f8d7da') # Green vs Red
+
+# Bill history grid labels (built once, reused on every rerun)
+_BILL_COLUMN_CONFIG = {
+    "bill_month": "Month",
+    "amount_due": "Due",
+    "payment_status": "Status",
+    "paid_date": "Paid On",
+    "amount_paid": "Paid Amt",
+    "psid": "PSID"
+}
+
 # ---------------------------------------------------------
 # 4. LOGIN SCREEN
 # ---------------------------------------------------------
@@ -199,21 +214,10 @@ elif menu == "Search Consumer":
                 if bills_res.data:
                     df_bills = pd.DataFrame(bills_res.data)
                     # Color the status
-                    def highlight_status(val):
-                        color = '#d4edda' if val == 'PAID' else '#f8d7da' # Green vs Red
-                        return f'background-color: {color}'
-                    
                     st.dataframe(
-                        df_bills.style.applymap(highlight_status, subset=['payment_status']),
+                        df_bills.style.apply(highlight_status, subset=['payment_status']),
                         use_container_width=True,
-                        column_config={
-                            "bill_month": "Month",
-                            "amount_due": "Due",
-                            "payment_status": "Status",
-                            "paid_date": "Paid On",
-                            "amount_paid": "Paid Amt",
-                            "psid": "PSID"
-                        }
+                        column_config=_BILL_COLUMN_CONFIG
                     )
                 else:
                     st.info("No bill history found.")
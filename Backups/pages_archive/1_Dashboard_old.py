@@ -18,9 +18,14 @@ st.markdown("---")
 # --- Custom Bill Query Tool ---
 st.subheader("Custom Bill Query")
 
+# Tehsil list changes rarely, so keep it across reruns instead of re-querying on every widget change
+@st.cache_data(ttl=600)
+def load_tehsils():
+    # distinct_cities() (database/location_lookups.sql) dedupes and sorts in Postgres
+    return [row['city_district'] for row in supabase.rpc('distinct_cities').execute().data]
+
 try:
-    locations_res = supabase.table('unique_locations').select('city_district').execute()
-    tehsils = sorted(list(set([loc['city_district'] for loc in locations_res.data])))
+    tehsils = load_tehsils()
 except Exception as e:
     st.error(f"Could not load Tehsil list: {e}")
     tehsils = []
@@ -51,22 +56,16 @@ if submitted:
                 end_timestamp = datetime.combine(query_end_date, time.max).isoformat()
                 
                 # --- Start building the query ---
-                query = supabase.table("bills").select("*", count='exact') \
+                # A tehsil filter goes through the bills_with_location view (database/bills_with_location.sql),
+                # which joins survey_units server-side instead of shipping an IN list of survey IDs
+                source_table = "bills" if selected_tehsil == "All Tehsils" else "bills_with_location"
+                query = supabase.table(source_table).select("*", count='exact') \
                     .gte('uploaded_at', start_timestamp) \
                     .lte('uploaded_at', end_timestamp) \
                     .in_('payment_status', selected_statuses)
                 
-                unit_ids_to_filter = None
-                
                 if selected_tehsil != "All Tehsils":
-                    units_res = supabase.table("survey_units").select("survey_id").eq("city_district", selected_tehsil).execute()
-                    if units_res.data:
-                        unit_ids_to_filter = [unit['survey_id'] for unit in units_res.data]
-                        query = query.in_("survey_id_fk", unit_ids_to_filter)
-                    else:
-                        st.info(f"No survey units found for Tehsil '{selected_tehsil}'. Query will likely return no results.")
-                        # Create an impossible condition to ensure no bills are returned
-                        query = query.in_("survey_id_fk", ["nonexistent_id"])
+                    query = query.eq('city_district', selected_tehsil)
 
                 # Execute the final query
                 results = query.execute()
@@ -74,8 +73,6 @@ if submitted:
                 with st.expander("🔍 Query Details", expanded=True):
                     st.write(f"**Time Range:** `{start_timestamp}` to `{end_timestamp}`")
                     st.write(f"**Tehsil Filter:** `{selected_tehsil}`")
-                    if unit_ids_to_filter is not None:
-                         st.write(f"Found `{len(unit_ids_to_filter)}` survey units to filter by.")
                     st.write(f"**Status Filter:** `{selected_statuses}`")
                     st.write(f"**Database Response:** Found **{results.count}** matching bills.")
 
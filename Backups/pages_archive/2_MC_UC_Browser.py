@@ -3,20 +3,12 @@ import streamlit as st
 import pandas as pd
 from components.auth import enforce_auth
 from components.db import supabase
+from components import styles
 from utils.session import check_session_timeout, update_last_activity
 from utils.exporters import download_button_csv, download_button_excel
-from components.pagination import paginate_data
 
 # --- Load Custom CSS ---
-def local_css(file_name):
-    with open(file_name) as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-
-try:
-    local_css("assets/style.css")
-    local_css("assets/mobile.css")
-except FileNotFoundError:
-    pass # CSS might be missing in dev
+styles.inject_css()
 
 # Check session timeout
 check_session_timeout()
@@ -28,39 +20,58 @@ update_last_activity()
 
 st.title("🧭 MC/UC Browser")
 
+# City/UC lists change rarely, so keep them across reruns instead of re-querying on every widget change.
+# Both come back distinct and sorted from the RPCs in database/location_lookups.sql.
+@st.cache_data(ttl=600)
+def load_cities():
+    return [row['city_district'] for row in supabase.rpc('distinct_cities').execute().data]
+
+@st.cache_data(ttl=600)
+def load_ucs(city):
+    return [row['uc_name'] for row in supabase.rpc('ucs_of', {'city': city}).execute().data]
+
+# Full record for the detail pane, kept across reruns so widget changes don't re-query it
+@st.cache_data(max_entries=256, ttl=3600)
+def load_consumer(survey_id):
+    return supabase.table('survey_units').select('*').eq('survey_id', survey_id).execute().data[0]
+
 # --- Filters ---
 try:
-    locations = pd.DataFrame(supabase.table('unique_locations').select('*').execute().data)
-    selected_city = st.selectbox("City", sorted(locations['city_district'].unique()))
-    ucs_in_city = sorted(locations[locations['city_district'] == selected_city]['uc_name'].unique())
-    selected_uc = st.selectbox("Union Council", ucs_in_city)
+    selected_city = st.selectbox("City", load_cities())
+    selected_uc = st.selectbox("Union Council", load_ucs(selected_city))
 except Exception as e:
     st.error(f"Could not load locations: {e}"); st.stop()
 
 # --- Data Display using st.dataframe with on_select ---
-consumers_res = supabase.table('survey_units').select('*').eq('uc_name', selected_uc).execute()
-df_consumers = pd.DataFrame(consumers_res.data)
+# The list columns for the whole UC, cached so row selections don't re-query
+@st.cache_data(ttl=60)
+def load_consumers(uc_name):
+    consumers_res = supabase.table('survey_units').select('survey_id, billing_consumer_name, billing_mobile, survey_address').eq('uc_name', uc_name).execute()
+    return pd.DataFrame(consumers_res.data)
+
+df_consumers = load_consumers(selected_uc)
 
 st.subheader(f"Consumers in {selected_uc}")
 
 # Export options
 st.subheader("📤 Export Options")
-exp_col1, exp_col2 = st.columns(2)
-with exp_col1:
-    download_button_csv(df_consumers, f"consumers_{selected_uc}.csv", "📥 Download CSV")
-with exp_col2:
-    download_button_excel(df_consumers, f"consumers_{selected_uc}.xlsx", "📊 Download Excel")
+if st.button("Prepare Export"):
+    df_export = pd.DataFrame(supabase.table('survey_units').select('*').eq('uc_name', selected_uc).execute().data)
+    exp_col1, exp_col2 = st.columns(2)
+    with exp_col1:
+        download_button_csv(df_export, f"consumers_{selected_uc}.csv", "📥 Download CSV")
+    with exp_col2:
+        download_button_excel(df_export, f"consumers_{selected_uc}.xlsx", "📊 Download Excel")
 
-# Show paginated data
-paginated_consumers = paginate_data(df_consumers.to_dict('records'), page_size=50, key_prefix="consumers")
-if paginated_consumers:
-    paginated_df = pd.DataFrame(paginated_consumers)
+# st.dataframe virtualizes scrolling in the browser, so the whole UC is rendered without manual pages
+if not df_consumers.empty:
     selection = st.dataframe(
-        paginated_df[['survey_id', 'billing_consumer_name', 'billing_mobile', 'survey_address']],
+        df_consumers,
         on_select="rerun",
         selection_mode="single-row",
         hide_index=True,
-        use_container_width=True
+        use_container_width=True,
+        height=600
     )
 else:
     st.info("No consumers found.")
@@ -69,10 +80,11 @@ else:
 # --- Detail View ---
 if selection.selection['rows']:
     selected_index = selection.selection['rows'][0]
-    # Adjust index for pagination
-    adjusted_index = (st.session_state.get("consumers_current_page", 1) - 1) * 50 + selected_index
-    if adjusted_index < len(df_consumers):
-        selected_consumer = df_consumers.iloc[adjusted_index].to_dict()
+    # The selected row index points straight into df_consumers;
+    # the full record (address, image, GPS) is only fetched for the selected row
+    if selected_index < len(df_consumers):
+        selected_id = df_consumers.iloc[selected_index]['survey_id']
+        selected_consumer = load_consumer(selected_id)
         
         st.markdown("---")
         st.subheader(f"Details for: {selected_consumer['survey_id']}")
@@ -88,11 +100,11 @@ if selection.selection['rows']:
                 st.info("No image available.")
         
         with main_cols[1]:
-            lat, lng = selected_consumer.get('gps_lat'), selected_consumer.get('gps_long')
-            if lat and lng and lat not in ['None', ''] and lng not in ['None', '']:
-                try:
-                    st.map(pd.DataFrame({'lat': [float(lat)], 'lon': [float(lng)]}))
-                except:
-                    st.info("Invalid GPS data.")
+            # Coordinates may be text ('None', ''); anything that isn't a number becomes NaN
+            lat, lng = pd.to_numeric(
+                pd.Series([selected_consumer.get('gps_lat'), selected_consumer.get('gps_long')]), errors='coerce'
+            )
+            if pd.notna(lat) and pd.notna(lng):
+                st.map(pd.DataFrame({'lat': [lat], 'lon': [lng]}))
             else: 
                 st.info("No GPS data.")
\ No newline at end of file
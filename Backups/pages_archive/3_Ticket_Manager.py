@@ -11,9 +11,15 @@ st.title("🎫 Ticket Manager")
 
 # --- Fetch Data ---
 try:
-    tickets_res = supabase.table('tickets').select('*, staff:reported_by_staff_id(full_name)').order('created_at', desc=True).execute()
-    # Use json_normalize to flatten the nested 'staff' data
-    df_tickets = pd.json_normalize(tickets_res.data, sep='_')
+    # Only the columns the grid shows (plus the reporter's name), not every ticket column
+    tickets_res = supabase.table('tickets').select(
+        'ticket_id, title, description, category, priority, status, created_at, reporter:reported_by_staff_id(full_name)'
+    ).order('created_at', desc=True).execute()
+    # The embedded reporter is the only nested field, so lift its name out directly
+    # instead of having json_normalize walk every key of every row
+    df_tickets = pd.DataFrame([
+        {**row, 'reporter': (row['reporter'] or {}).get('full_name')} for row in tickets_res.data
+    ]).rename(columns={'reporter': 'reporter_full_name'})
 except Exception as e:
     st.error(f"Could not load tickets: {e}")
     df_tickets = pd.DataFrame() # Ensure df_tickets is an empty dataframe on error
@@ -30,19 +36,20 @@ if not df_tickets.empty:
     st.info("Select tickets from the grid and use the buttons below to approve or reject them.")
     grid_response = AgGrid(df_tickets, gridOptions=gridOptions, enable_enterprise_modules=False, update_mode='MODEL_CHANGED', height=500, fit_columns_on_grid_load=True)
 
-    selected_rows = grid_response['selected_rows']
+    # The selection comes back as a DataFrame or a list of dicts depending on the st_aggrid version;
+    # as a DataFrame the IDs are taken as one column instead of a lookup per row
+    selected_df = pd.DataFrame(grid_response['selected_rows'])
 
     # --- Admin Actions ---
-    if selected_rows:
+    if not selected_df.empty:
+        ticket_ids = selected_df['ticket_id'].tolist()
         st.subheader("Admin Actions")
         action_cols = st.columns(2)
         if action_cols[0].button("Approve Selected", type="primary"):
-            ticket_ids = [row['ticket_id'] for row in selected_rows]
             supabase.table('tickets').update({'status': 'APPROVED'}).in_('ticket_id', ticket_ids).execute()
             st.success("Tickets approved!"); st.rerun()
         
         if action_cols[1].button("Reject Selected"):
-            ticket_ids = [row['ticket_id'] for row in selected_rows]
             supabase.table('tickets').update({'status': 'REJECTED'}).in_('ticket_id', ticket_ids).execute()
             st.warning("Tickets rejected!"); st.rerun()
 else:
@@ -8,26 +8,36 @@ from components.forms import StaffModel
 from components.ui import confirmation_modal # This import will now work
 from utils.security import hash_password  # Import password hashing function
 
+# Role options and their selectbox positions, built once rather than on every rerun
+ROLES = ("AGENT", "SUPERVISOR", "MANAGER", "HEAD")
+ROLE_IDX = {role: i for i, role in enumerate(ROLES)}
+
 enforce_auth(head_admin_only=True)
 
 st.title("👥 Staff Account Management")
 
 # --- Fetch and Display Staff ---
-staff_res = supabase.table('staff').select('*').order('id').execute()
+# Only the displayed columns (never the password hash), one page of staff per request
+STAFF_PAGE_SIZE = 200
+staff_page = st.number_input("Page", min_value=1, value=1, step=1)
+page_start = (staff_page - 1) * STAFF_PAGE_SIZE
+staff_res = supabase.table('staff').select('id, username, full_name, role, assigned_city, is_active') \
+    .order('id').range(page_start, page_start + STAFF_PAGE_SIZE - 1).execute()
 df_staff = pd.DataFrame(staff_res.data)
-selection = st.dataframe(df_staff.drop(columns=['password']), on_select='rerun', selection_mode='single-row', use_container_width=True)
+selection = st.dataframe(df_staff, on_select='rerun', selection_mode='single-row', use_container_width=True)
 
-# --- Tabs for Create/Edit/Delete ---
-tab_create, tab_edit = st.tabs(["➕ Create New Staff", "✍️ Edit / Delete Selected"])
+# --- Create/Edit/Delete views ---
+# A radio instead of st.tabs: tabs run every body on each rerun, this builds only the active view
+active_view = st.radio("View", ["➕ Create New Staff", "✍️ Edit / Delete Selected"], horizontal=True, label_visibility="collapsed")
 
-with tab_create:
+if active_view == "➕ Create New Staff":
     with st.form("new_staff_form"):
         st.subheader("New Staff Details")
         new_user = {
             "username": st.text_input("Username"),
             "password": st.text_input("Password", type="password"),
             "full_name": st.text_input("Full Name"),
-            "role": st.selectbox("Role", ["AGENT", "SUPERVISOR", "MANAGER", "HEAD"]),
+            "role": st.selectbox("Role", ROLES),
             "assigned_city": st.text_input("Assigned City"),
             "is_active": st.checkbox("Is Active", value=True)
             # assigned_ucs can be added here if needed
@@ -48,7 +58,7 @@ with tab_create:
         except Exception as e:
             st.error(f"Error creating user: {e}")
 
-with tab_edit:
+else:
     if not selection.selection['rows']:
         st.info("Select a staff member from the table above to edit or delete.")
     else:
@@ -61,7 +71,7 @@ with tab_edit:
             # Pre-populate form with existing data
             edited_user = {
                 "full_name": st.text_input("Full Name", value=user_data.get('full_name', '')),
-                "role": st.selectbox("Role", ["AGENT", "SUPERVISOR", "MANAGER", "HEAD"], index=["AGENT", "SUPERVISOR", "MANAGER", "HEAD"].index(user_data.get('role', 'AGENT'))),
+                "role": st.selectbox("Role", ROLES, index=ROLE_IDX.get(user_data.get('role', 'AGENT'), 0)),
                 "assigned_city": st.text_input("Assigned City", value=user_data.get('assigned_city', '')),
                 "password": st.text_input("New Password (leave blank to keep unchanged)", type="password"),
                 "is_active": st.checkbox("Is Active", value=user_data.get('is_active', True))
@@ -5,8 +5,13 @@ Checks if all required packages are installed and importable
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
 from typing import List, Tuple
 
+# Imports are mostly disk reads of package files, so several run at once
+MAX_IMPORT_WORKERS = 8
+
 def check_import(package_name: str, import_name: str = None) -> Tuple[bool, str]:
     """
     Try to import a package and return status
@@ -22,10 +27,27 @@ def check_import(package_name: str, import_name: str = None) -> Tuple[bool, str]
         import_name = package_name
     
     try:
-        __import__(import_name)
+        import_module(import_name)
         return True, f"✅ {package_name}"
     except ImportError as e:
         return False, f"❌ {package_name}: {str(e)}"
+    except Exception as e:
+        # Anything else raised while importing (a broken install, a deadlock between
+        # concurrent imports) is a failed dependency too, not a crash of the whole check
+        return False, f"❌ {package_name}: {type(e).__name__}: {str(e)}"
+
+def check_imports(packages: List[Tuple[str, str]]) -> List[Tuple[bool, str]]:
+    """
+    Check several packages concurrently
+    
+    Args:
+        packages: (display name, import name) pairs
+    
+    Returns:
+        List of (success, message) tuples in the same order as packages
+    """
+    with ThreadPoolExecutor(max_workers=MAX_IMPORT_WORKERS) as executor:
+        return list(executor.map(lambda package: check_import(*package), packages))
 
 def main():
     """Main verification function"""
@@ -58,31 +80,27 @@ def main():
         ("OpenPyXL", "openpyxl"),
     ]
     
-    all_success = True
+    # Packages both components use are imported once; every section still lists them
+    all_packages = {}
+    for display_name, import_name in cloud_app_packages + local_engine_packages:
+        all_packages.setdefault(import_name, display_name)
     
-    # Check Cloud App dependencies
-    print("📦 CLOUD APP DEPENDENCIES (02_Cloud_App)")
-    print("-" * 70)
-    for display_name, import_name in cloud_app_packages:
-        success, message = check_import(display_name, import_name)
-        print(message)
-        if not success:
-            all_success = False
+    packages = [(display_name, import_name) for import_name, display_name in all_packages.items()]
+    results = dict(zip(all_packages, check_imports(packages)))
     
-    print()
+    all_success = all(success for success, _ in results.values())
     
-    # Check Local Engine dependencies
-    print("🔧 LOCAL ENGINE DEPENDENCIES (01_Local_Engine)")
-    print("-" * 70)
-    checked_local = set()
-    for display_name, import_name in local_engine_packages:
-        # Avoid duplicate checks
-        if import_name not in checked_local:
-            success, message = check_import(display_name, import_name)
-            print(message)
-            checked_local.add(import_name)
-            if not success:
-                all_success = False
+    sections = [
+        ("📦 CLOUD APP DEPENDENCIES (02_Cloud_App)", cloud_app_packages),
+        ("🔧 LOCAL ENGINE DEPENDENCIES (01_Local_Engine)", local_engine_packages),
+    ]
+    for index, (header, section_packages) in enumerate(sections):
+        if index:
+            print()
+        print(header)
+        print("-" * 70)
+        for _, import_name in section_packages:
+            print(results[import_name][1])
     
     print()
     print("=" * 70)